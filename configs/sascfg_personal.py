@@ -12,92 +12,44 @@ SAS_config_names = ['ssh_dev',
                    'ssh_win_prod',
                    'ssh_win_batch_prod']
 
-# DEV (UNIX)
-ssh_dev     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misdev1',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+_SAS_EN = '/sas/sas94/SASFoundation/9.4/bin/sas_en'
+_SSH_UNIX = '/usr/bin/ssh'
+_SSH_WIN = 'ssh'
 
-ssh_batch_dev     = {'saspath' : '/sas/conf/DEV/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misdev1',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
 
-# UAT (UNIX)
-ssh_uat     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misuat',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+def _batch(env):
+    return f'/sas/conf/{env}/ENGINEAdmin/BatchServer/sasbatch.sh'
 
-ssh_batch_uat     = {'saspath' : '/sas/conf/UAT/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misuat',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
 
-# PROD (UNIX)
-ssh_prod     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misprod',
+def _cfg(saspath, ssh, host):
+    return {'saspath'    : saspath,
+            'ssh'        : ssh,
+            'host'       : f'misadmin@{host}',
             'encoding'   : 'latin2',
             'options'    : ["-fullstimer"]
             }
 
-ssh_batch_prod     = {'saspath' : '/sas/conf/PROD/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : '/usr/bin/ssh',
-            'host'       : 'misadmin@misprod',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
 
-# DEV (Windows)
-ssh_win_dev     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misdev1',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# DEV (UNIX)
+ssh_dev            = _cfg(_SAS_EN, _SSH_UNIX, 'misdev1')
+ssh_batch_dev      = _cfg(_batch('DEV'), _SSH_UNIX, 'misdev1')
 
-ssh_win_batch_dev     = {'saspath' : '/sas/conf/DEV/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misdev1',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# UAT (UNIX)
+ssh_uat            = _cfg(_SAS_EN, _SSH_UNIX, 'misuat')
+ssh_batch_uat      = _cfg(_batch('UAT'), _SSH_UNIX, 'misuat')
 
-# UAT (Windows)
-ssh_win_uat     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misuat',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# PROD (UNIX)
+ssh_prod           = _cfg(_SAS_EN, _SSH_UNIX, 'misprod')
+ssh_batch_prod     = _cfg(_batch('PROD'), _SSH_UNIX, 'misprod')
 
-ssh_win_batch_uat     = {'saspath' : '/sas/conf/UAT/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misuat',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# DEV (Windows)
+ssh_win_dev        = _cfg(_SAS_EN, _SSH_WIN, 'misdev1')
+ssh_win_batch_dev  = _cfg(_batch('DEV'), _SSH_WIN, 'misdev1')
 
-# PROD (Windows)
-ssh_win_prod     = {'saspath' : '/sas/sas94/SASFoundation/9.4/bin/sas_en',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misprod',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# UAT (Windows)
+ssh_win_uat        = _cfg(_SAS_EN, _SSH_WIN, 'misuat')
+ssh_win_batch_uat  = _cfg(_batch('UAT'), _SSH_WIN, 'misuat')
 
-ssh_win_batch_prod     = {'saspath' : '/sas/conf/PROD/ENGINEAdmin/BatchServer/sasbatch.sh',
-            'ssh'        : 'ssh',
-            'host'       : 'misadmin@misprod',
-            'encoding'   : 'latin2',
-            'options'    : ["-fullstimer"]
-            }
+# PROD (Windows)
+ssh_win_prod       = _cfg(_SAS_EN, _SSH_WIN, 'misprod')
+ssh_win_batch_prod = _cfg(_batch('PROD'), _SSH_WIN, 'misprod')
@@ -1,52 +1,255 @@
 """Integracja z Bitbucket Server/Cloud: pobieranie, scalanie PR i klonowanie."""
 from __future__ import annotations
 
+import json
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, cast
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, Callable, Iterator, Protocol, cast
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
-import urllib3
+
+try:
+    import orjson
+
+    _json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
 
 from .config import Config
 from .logger import info
 from .models import PullRequest, parse_server_pr, parse_cloud_pr
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 __all__ = [
     "BitbucketPlatform",
     "BitbucketServerPlatform",
     "BitbucketCloudPlatform",
     "create_platform",
     "get_pull_requests",
+    "iter_pull_requests",
     "PullRequest",
 ]
 
 
+_RETRY = Retry(
+    total=5,
+    read=5,
+    connect=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+_ADAPTER = HTTPAdapter(max_retries=_RETRY, pool_connections=10, pool_maxsize=20)
+
+_OUT_OF_DATE_RE = re.compile(r"out[- ]of[- ]date", re.IGNORECASE)
+
+_SESSION: requests.Session | None = None
+_PAGE_FETCH_WORKERS = 8
+_SERVER_CHANGED_TYPES = frozenset({"ADD", "MODIFY", "MOVE", "COPY"})
+_SERVER_DELETED_TYPES = frozenset({"DELETE"})
+_CLOUD_CHANGED_STATUSES = frozenset({"added", "modified", "renamed"})
+_CLOUD_DELETED_STATUSES = frozenset({"removed"})
+
+_HTTP_ERRORS: tuple[type[Exception], ...] = (requests.exceptions.RequestException,)
+if httpx is not None:
+    _HTTP_ERRORS += (httpx.HTTPError,)
+
+
 def _create_session() -> requests.Session:
     """Tworzy sesję HTTP z retry dla stabilniejszych wywołań API.
 
+    Wszystkie sesje montują ten sam, zbudowany raz adapter z pulą połączeń.
+
     Returns:
         Skonfigurowana sesja HTTP z mechanizmem retry.
     """
     session = requests.Session()
-    retry = Retry(
-        total=5,
-        read=5,
-        connect=5,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=frozenset({"GET", "POST"}),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+    session.mount("https://", _ADAPTER)
+    session.mount("http://", _ADAPTER)
     return session
 
 
+def _get_session() -> requests.Session:
+    """Zwraca współdzieloną sesję HTTP z retry (tworzoną przy pierwszym użyciu).
+
+    Jedna sesja na proces pozwala ponownie wykorzystywać połączenia keep-alive
+    do hosta Bitbucket zamiast nawiązywać TLS przy każdym wywołaniu API.
+
+    Returns:
+        Skonfigurowana sesja HTTP z mechanizmem retry.
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _create_session()
+    return _SESSION
+
+
+class _HttpResponse(Protocol):
+    """Wspólny interfejs odpowiedzi HTTP (requests i httpx)."""
+
+    status_code: int
+
+    @property
+    def content(self) -> bytes: ...
+
+    @property
+    def text(self) -> str: ...
+
+    def json(self) -> Any: ...
+
+    def raise_for_status(self) -> Any: ...
+
+
+class _HttpClient(Protocol):
+    """Wspólny interfejs klienta HTTP używanego przez platformy Bitbucket."""
+
+    def get(self, url: str, *, timeout: float) -> _HttpResponse: ...
+
+    def post(self, url: str, *, json: Any, timeout: float) -> _HttpResponse: ...
+
+    def close(self) -> None: ...
+
+
+class _RequestsClient:
+    """Klient HTTP oparty o współdzieloną sesję requests z nagłówkami platformy."""
+
+    def __init__(self, headers: dict[str, str], verify: str | bool):
+        """Inicjalizuje klienta.
+
+        Args:
+            headers: Nagłówki dołączane do każdego żądania (autoryzacja).
+            verify: Ścieżka do pakietu CA lub True (systemowe CA).
+        """
+        self._headers = headers
+        self._verify = verify
+
+    def get(self, url: str, *, timeout: float) -> requests.Response:
+        """Wysyła żądanie GET.
+
+        Args:
+            url: Adres żądania.
+            timeout: Limit czasu żądania w sekundach.
+
+        Returns:
+            Odpowiedź HTTP.
+        """
+        return _get_session().get(
+            url, headers=self._headers, verify=self._verify, timeout=timeout
+        )
+
+    def post(self, url: str, *, json: Any, timeout: float) -> requests.Response:
+        """Wysyła żądanie POST z treścią JSON.
+
+        Args:
+            url: Adres żądania.
+            json: Treść żądania (None oznacza brak treści).
+            timeout: Limit czasu żądania w sekundach.
+
+        Returns:
+            Odpowiedź HTTP.
+        """
+        return _get_session().post(
+            url, headers=self._headers, json=json, verify=self._verify, timeout=timeout
+        )
+
+    def close(self) -> None:
+        """Nie zamyka niczego - sesja requests jest współdzielona w procesie."""
+
+
+class _HttpxClient:
+    """Klient HTTP/2 oparty o httpx z ponawianiem żądań według _RETRY.
+
+    Transport httpx ponawia tylko nieudane połączenia, dlatego odpowiedzi
+    o statusach z `_RETRY.status_forcelist` (429, 5xx) są ponawiane tutaj,
+    z backoffem i nagłówkiem Retry-After jak w sesji requests.
+    """
+
+    def __init__(self, headers: dict[str, str], verify: str | bool):
+        """Inicjalizuje klienta.
+
+        Args:
+            headers: Nagłówki dołączane do każdego żądania (autoryzacja).
+            verify: Ścieżka do pakietu CA lub True (systemowe CA).
+
+        Raises:
+            ImportError: Gdy brak pakietu h2 wymaganego dla HTTP/2.
+        """
+        transport = httpx.HTTPTransport(retries=5, http2=True, verify=verify)
+        self._client = httpx.Client(
+            transport=transport,
+            timeout=15,
+            headers=headers,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Wysyła żądanie, ponawiając je dla statusów z _RETRY.status_forcelist.
+
+        Args:
+            method: Metoda HTTP.
+            url: Adres żądania.
+            **kwargs: Dodatkowe argumenty `httpx.Client.request`.
+
+        Returns:
+            Odpowiedź HTTP (ostatnia, gdy wyczerpano próby).
+        """
+        total = cast(int, _RETRY.total)
+        attempt = 0
+        while True:
+            resp = self._client.request(method, url, **kwargs)
+            retry_after = resp.headers.get("Retry-After")
+            if attempt >= total or not _RETRY.is_retry(
+                method, resp.status_code, retry_after is not None
+            ):
+                return resp
+            resp.close()
+            if retry_after is not None:
+                delay = _RETRY.parse_retry_after(retry_after)
+            else:
+                delay = _RETRY.backoff_factor * 2**attempt
+            time.sleep(min(delay, Retry.DEFAULT_BACKOFF_MAX))
+            attempt += 1
+
+    def get(self, url: str, *, timeout: float) -> httpx.Response:
+        """Wysyła żądanie GET.
+
+        Args:
+            url: Adres żądania.
+            timeout: Limit czasu żądania w sekundach.
+
+        Returns:
+            Odpowiedź HTTP.
+        """
+        return self._request("GET", url, timeout=timeout)
+
+    def post(self, url: str, *, json: Any, timeout: float) -> httpx.Response:
+        """Wysyła żądanie POST z treścią JSON.
+
+        Args:
+            url: Adres żądania.
+            json: Treść żądania (None oznacza brak treści).
+            timeout: Limit czasu żądania w sekundach.
+
+        Returns:
+            Odpowiedź HTTP.
+        """
+        return self._request("POST", url, json=json, timeout=timeout)
+
+    def close(self) -> None:
+        """Zamyka połączenia klienta httpx."""
+        self._client.close()
+
+
 class BitbucketPlatform(ABC):
     """Abstrakcja platformy Bitbucket (wspólne API dla Server i Cloud).
 
@@ -56,33 +259,52 @@ class BitbucketPlatform(ABC):
         project_or_workspace: Projekt (Server) lub workspace (Cloud).
     """
 
-    def __init__(self, repo: str, token: str, project_or_workspace: str):
+    def __init__(
+        self,
+        repo: str,
+        token: str,
+        project_or_workspace: str,
+        *,
+        ca_bundle: str | None = None,
+    ):
         """Inicjalizuje platformę Bitbucket.
 
         Args:
             repo: Nazwa repozytorium.
             token: Token autoryzacyjny API.
             project_or_workspace: Projekt (Server) lub workspace (Cloud).
+            ca_bundle: Ścieżka do pakietu certyfikatów CA do weryfikacji TLS
+                (domyślnie systemowe CA).
         """
         self.repo = repo
         self.token = token
         self.project_or_workspace = project_or_workspace
+        self._headers = {"Authorization": f"Bearer {token}"}
+        self._verify: str | bool = ca_bundle or True
 
-    @abstractmethod
-    def get_api_prs_url(self) -> str:
-        """Zwraca pełny URL endpointu API listy otwartych PR.
+    @cached_property
+    def _client(self) -> _HttpClient:
+        """Klient HTTP platformy (domyślnie współdzielona sesja requests)."""
+        return _RequestsClient(self._headers, self._verify)
 
-        Returns:
-            Pełny URL endpointu API.
+    def close(self) -> None:
+        """Zamyka klienta HTTP platformy, jeśli został utworzony.
+
+        Kolejne wywołanie API po zamknięciu utworzy nowego klienta.
         """
+        client = self.__dict__.pop("_client", None)
+        if client is not None:
+            client.close()
 
+    @property
     @abstractmethod
-    def get_clone_url(self) -> str:
-        """Zwraca URL używany do klonowania repozytorium (SSH).
+    def api_prs_url(self) -> str:
+        """Pełny URL endpointu API listy otwartych PR."""
 
-        Returns:
-            URL do klonowania repozytorium przez SSH.
-        """
+    @property
+    @abstractmethod
+    def clone_url(self) -> str:
+        """URL używany do klonowania repozytorium (SSH)."""
 
     @abstractmethod
     def parse_pr(self, raw: dict[str, Any]) -> PullRequest:
@@ -106,15 +328,38 @@ class BitbucketPlatform(ABC):
             Krotka (True, None) przy powodzeniu lub (False, przyczyna) przy niepowodzeniu.
         """
 
+    def get_pr_changed_files(self, pr: PullRequest) -> set[str] | None:
+        """Zwraca ścieżki plików dodanych/zmienionych w PR według API Bitbucket.
+
+        Implementacja bazowa nie obsługuje tej operacji.
+
+        Args:
+            pr: Obiekt PullRequest.
+
+        Returns:
+            Zbiór ścieżek plików lub None, gdy API nie dostarczyło pełnych
+            danych (wtedy zmiany należy wyznaczyć przez git).
+        """
+        return None
+
 
 class BitbucketServerPlatform(BitbucketPlatform):
     """Implementacja dla Bitbucket Server."""
 
-    def __init__(self, repo: str, token: str, project_or_workspace: str, host: str):
-        super().__init__(repo, token, project_or_workspace)
+    def __init__(
+        self,
+        repo: str,
+        token: str,
+        project_or_workspace: str,
+        host: str,
+        *,
+        ca_bundle: str | None = None,
+    ):
+        super().__init__(repo, token, project_or_workspace, ca_bundle=ca_bundle)
         self.host = host
 
-    def get_api_prs_url(self) -> str:
+    @cached_property
+    def api_prs_url(self) -> str:
         base_url = (
             f"https://{self.host}/rest/api/1.0/projects/"
             f"{self.project_or_workspace}/repos/{self.repo}/pull-requests"
@@ -122,7 +367,8 @@ class BitbucketServerPlatform(BitbucketPlatform):
         params = "state=OPEN&at=refs/heads/master"
         return f"{base_url}?{params}"
 
-    def get_clone_url(self) -> str:
+    @cached_property
+    def clone_url(self) -> str:
         return (
             f"ssh://git@{self.host}:7999/{self.project_or_workspace.lower()}/"
             f"{self.repo}.git"
@@ -137,41 +383,28 @@ class BitbucketServerPlatform(BitbucketPlatform):
             f"https://{self.host}/rest/api/1.0/projects/"
             f"{self.project_or_workspace}/repos/{self.repo}/pull-requests/{pr_id}/merge"
         )
-        session = _create_session()
-        headers = {"Authorization": f"Bearer {self.token}"}
+        client = self._client
         params: dict[str, Any] = {}
         if pr.version is not None:
             params["version"] = pr.version
-        def _do_post(p: dict[str, Any]) -> tuple[bool, str | None, requests.Response | None]:
+
+        def _do_post(p: dict[str, Any]) -> tuple[bool, str | None, _HttpResponse | None]:
             try:
-                resp = session.post(url, headers=headers, json=p or None, verify=False, timeout=15)
-            except requests.exceptions.RequestException as exc:
+                resp = client.post(url, json=p or None, timeout=15)
+            except _HTTP_ERRORS as exc:
                 return False, f"Błąd sieciowy podczas merge: {exc}", None
 
             if resp.status_code == 200:
                 return True, None, resp
 
-            reason_local: str | None = None
+            reason_local: str | None
             try:
-                data = cast(dict[str, Any], resp.json())
-                errs = cast(list[Any] | None, data.get("errors"))
-                if isinstance(errs, list) and errs:
-                    messages: list[str] = []
-                    for e in errs:
-                        msg: str | None = None
-                        if isinstance(e, dict):
-                            e_dict = cast(dict[str, Any], e)
-                            msg = cast(str | None, e_dict.get("message"))
-                        if isinstance(msg, str) and msg:
-                            messages.append(msg)
-                        else:
-                            messages.append(str(cast(object, e)))
-                    reason_local = "; ".join(messages)
-                if not reason_local:
-                    m = data.get("message")
-                    if isinstance(m, str):
-                        reason_local = m
-            except (ValueError, TypeError):
+                data = resp.json()
+                errs = data.get("errors") or ()
+                reason_local = "; ".join(
+                    e["message"] for e in errs if "message" in e
+                ) or data.get("message")
+            except (ValueError, TypeError, KeyError, AttributeError):
                 reason_local = resp.text or f"HTTP {resp.status_code}"
 
             if not reason_local:
@@ -182,18 +415,13 @@ class BitbucketServerPlatform(BitbucketPlatform):
         ok_flag, reason, resp = _do_post(params)
 
         if not ok_flag and resp is not None:
-            reason_lc = (reason or "").lower()
-            if ("out-of-date" in reason_lc
-                or "out of date" in reason_lc
-                or "attempting to modify a pull request based on out-of-date" in reason_lc
-            ):
-
+            if _OUT_OF_DATE_RE.search(reason or ""):
                 pr_url = (
                     f"https://{self.host}/rest/api/1.0/projects/"
                     f"{self.project_or_workspace}/repos/{self.repo}/pull-requests/{pr_id}"
                 )
                 try:
-                    pr_resp = session.get(pr_url, headers=headers, verify=False, timeout=10)
+                    pr_resp = client.get(pr_url, timeout=10)
                     pr_resp.raise_for_status()
                     pr_data = pr_resp.json()
                     new_version = pr_data.get("version")
@@ -203,16 +431,54 @@ class BitbucketServerPlatform(BitbucketPlatform):
                         if ok_flag2:
                             return True, None
                         return False, reason2 or reason
-                except requests.exceptions.RequestException as exc:
+                except _HTTP_ERRORS as exc:
                     return False, f"Błąd przy odświeżaniu PR przed retry: {exc}"
 
         return ok_flag, reason
 
+    def get_pr_changed_files(self, pr: PullRequest) -> set[str] | None:
+        base = (
+            f"https://{self.host}/rest/api/1.0/projects/"
+            f"{self.project_or_workspace}/repos/{self.repo}/pull-requests/{pr.id}"
+            "/changes?limit=1000"
+        )
+        changed: set[str] = set()
+        start = 0
+        try:
+            while True:
+                data = _fetch_page(self._client, f"{base}&start={start}", 10)
+                for change in _page_values(data):
+                    kind = change.get("type")
+                    if kind in _SERVER_DELETED_TYPES:
+                        continue
+                    if kind not in _SERVER_CHANGED_TYPES:
+                        return None
+                    changed.add(change["path"]["toString"])
+                if data.get("isLastPage") is not False:
+                    return changed
+                start = int(data["nextPageStart"])
+        except (RuntimeError, KeyError, TypeError, ValueError):
+            return None
+
 
 class BitbucketCloudPlatform(BitbucketPlatform):
-    """Implementacja dla Bitbucket Cloud."""
+    """Implementacja dla Bitbucket Cloud.
+
+    Gdy dostępny jest pakiet httpx (extra 'http2'), żądania idą przez jednego
+    klienta HTTP/2, który multipleksuje je w ramach jednego połączenia TLS.
+    """
+
+    @cached_property
+    def _client(self) -> _HttpClient:
+        if httpx is None:
+            return super()._client
+        try:
+            return _HttpxClient(self._headers, self._verify)
+        except ImportError:
+            return super()._client
 
-    def get_api_prs_url(self) -> str:
+    @cached_property
+    def api_prs_url(self) -> str:
         base_url = (
             "https://api.bitbucket.org/2.0/repositories/"
             f"{self.project_or_workspace}/{self.repo}/pullrequests"
@@ -220,7 +486,8 @@ class BitbucketCloudPlatform(BitbucketPlatform):
         params = "state=OPEN&fields=%2Bvalues.participants"
         return f"{base_url}?{params}"
 
-    def get_clone_url(self) -> str:
+    @cached_property
+    def clone_url(self) -> str:
         return f"git@bitbucket.org:{self.project_or_workspace}/{self.repo}.git"
 
     def parse_pr(self, raw: dict[str, Any]) -> PullRequest:
@@ -232,11 +499,9 @@ class BitbucketCloudPlatform(BitbucketPlatform):
             "https://api.bitbucket.org/2.0/repositories/"
             f"{self.project_or_workspace}/{self.repo}/pullrequests/{pr_id}/merge"
         )
-        session = _create_session()
-        headers = {"Authorization": f"Bearer {self.token}"}
         try:
-            resp = session.post(url, headers=headers, json={}, verify=False, timeout=15)
-        except requests.exceptions.RequestException as exc:
+            resp = self._client.post(url, json={}, timeout=15)
+        except _HTTP_ERRORS as exc:
             return False, f"Błąd sieciowy podczas merge: {exc}"
 
         if resp.status_code in (200, 201):
@@ -258,6 +523,28 @@ class BitbucketCloudPlatform(BitbucketPlatform):
             reason = f"HTTP {resp.status_code}"
         return False, reason
 
+    def get_pr_changed_files(self, pr: PullRequest) -> set[str] | None:
+        url: str | None = (
+            "https://api.bitbucket.org/2.0/repositories/"
+            f"{self.project_or_workspace}/{self.repo}/pullrequests/{pr.id}"
+            "/diffstat?pagelen=500"
+        )
+        changed: set[str] = set()
+        try:
+            while url:
+                data = _fetch_page(self._client, url, 10)
+                for entry in _page_values(data):
+                    status = entry.get("status")
+                    if status in _CLOUD_DELETED_STATUSES:
+                        continue
+                    if status not in _CLOUD_CHANGED_STATUSES:
+                        return None
+                    changed.add(entry["new"]["path"])
+                url = data.get("next")
+        except (RuntimeError, KeyError, TypeError):
+            return None
+        return changed
+
 
 def create_platform(config: Config, repo: str) -> BitbucketPlatform:
     """Buduje obiekt platformy wg konfiguracji (Server lub Cloud).
@@ -273,6 +560,7 @@ def create_platform(config: Config, repo: str) -> BitbucketPlatform:
     is_server = config.get("is_bitbucket_server", False)
     token = config.get("bitbucket_api_token") or ""
     project_or_workspace = config.get("bitbucket_project_or_workspace") or ""
+    ca_bundle = config.get("bitbucket_ca_bundle") or None
 
     if is_server:
         host = config.get("bitbucket_host") or ""
@@ -282,59 +570,152 @@ def create_platform(config: Config, repo: str) -> BitbucketPlatform:
             token=token,
             project_or_workspace=project_or_workspace,
             host=host,
+            ca_bundle=ca_bundle,
         )
 
     info("Tryb: Bitbucket Cloud")
     return BitbucketCloudPlatform(
-        repo=repo, token=token, project_or_workspace=project_or_workspace
+        repo=repo,
+        token=token,
+        project_or_workspace=project_or_workspace,
+        ca_bundle=ca_bundle,
     )
 
 
-def get_pull_requests(platform: BitbucketPlatform, *, timeout: int = 10) -> list[PullRequest]:
-    """Zwraca listę otwartych PR jako obiekty PullRequest.
+def _fetch_page(client: _HttpClient, url: str, timeout: int) -> dict[str, Any]:
+    """Pobiera pojedynczą stronę listy PR z API Bitbucket.
 
     Args:
-        platform: Obiekt platformy Bitbucket.
+        client: Klient HTTP platformy.
+        url: Pełny URL strony.
         timeout: Limit czasu żądania HTTP w sekundach.
 
     Returns:
-        Lista obiektów PullRequest reprezentujących otwarte PR.
+        Zdekodowana odpowiedź JSON strony.
 
     Raises:
         RuntimeError: Gdy nie udało się pobrać danych z Bitbucket.
     """
-    session = _create_session()
-    url = platform.get_api_prs_url()
-    headers = {"Authorization": f"Bearer {platform.token}"}
-
-    raw_prs: list[dict[str, Any]] = []
-    while True:
-        try:
-            response = session.get(url, headers=headers, verify=False, timeout=timeout)
+    try:
+        response = client.get(url, timeout=timeout)
+        if response.status_code >= 400:
             response.raise_for_status()
-            data = response.json()
-        except requests.exceptions.RequestException as exc:
-            raise RuntimeError(f"Nie udało się pobrać danych z Bitbucket: {exc}") from exc
+        return cast(dict[str, Any], _json_loads(response.content))
+    except _HTTP_ERRORS as exc:
+        raise RuntimeError(f"Nie udało się pobrać danych z Bitbucket: {exc}") from exc
+    except ValueError as exc:
+        raise RuntimeError(f"Niepoprawna odpowiedź JSON z Bitbucket: {exc}") from exc
+
 
-        values = data.get("values", [])
-        if isinstance(values, list):
-            values_list = cast(list[dict[str, Any]], values)
-            raw_prs.extend(values_list)
+def _page_values(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Zwraca listę surowych PR ze strony odpowiedzi API.
+
+    Args:
+        data: Zdekodowana odpowiedź JSON strony.
 
+    Returns:
+        Lista surowych słowników PR (pusta, gdy brak pola values).
+    """
+    values = data.get("values", [])
+    if isinstance(values, list):
+        return cast(list[dict[str, Any]], values)
+    return []
+
+
+def _fetch_offset_pages(
+    client: _HttpClient,
+    base: str,
+    timeout: int,
+    first_page: dict[str, Any],
+) -> Iterator[dict[str, Any]]:
+    """Pobiera równolegle kolejne strony Bitbucket Server adresowane przez offset.
+
+    API Server nie zwraca łącznej liczby PR, dlatego strony pobierane są
+    falami kolejnych offsetów, aż któraś z nich będzie ostatnia. Pierwsza fala
+    obejmuje jedną stronę, a każda następna jest dwa razy większa (do
+    _PAGE_FETCH_WORKERS), więc dla repozytoriów z kilkoma stronami nie są
+    wysyłane żądania daleko poza koniec listy. Po ostatniej stronie
+    niewysłane żądania są anulowane, a na trwające nie czeka się.
+
+    Args:
+        client: Klient HTTP platformy.
+        base: Bazowy URL listy PR.
+        timeout: Limit czasu żądania HTTP w sekundach.
+        first_page: Odpowiedź pierwszej strony (z nextPageStart i limit).
+
+    Yields:
+        Zdekodowane odpowiedzi kolejnych stron w kolejności offsetów.
+
+    Raises:
+        RuntimeError: Gdy nie udało się pobrać danych z Bitbucket.
+    """
+    start = int(first_page["nextPageStart"])
+    limit = int(first_page.get("limit") or start)
+
+    def _fetch(offset: int) -> dict[str, Any]:
+        return _fetch_page(client, f"{base}&start={offset}", timeout)
+
+    executor = ThreadPoolExecutor(max_workers=_PAGE_FETCH_WORKERS)
+    try:
+        wave = 1
+        while True:
+            offsets = [start + i * limit for i in range(wave)]
+            futures = [executor.submit(_fetch, offset) for offset in offsets]
+            for future in futures:
+                page = future.result()
+                yield page
+                if page.get("isLastPage") is not False:
+                    return
+            start = offsets[-1] + limit
+            wave = min(wave * 2, _PAGE_FETCH_WORKERS)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pull_requests(platform: BitbucketPlatform, *, timeout: int = 10) -> Iterator[PullRequest]:
+    """Zwraca otwarte PR jako obiekty PullRequest, strona po stronie.
+
+    Kolejne strony pobierane są dopiero w miarę konsumowania wyników.
+
+    Args:
+        platform: Obiekt platformy Bitbucket.
+        timeout: Limit czasu żądania HTTP w sekundach.
+
+    Yields:
+        Obiekty PullRequest reprezentujące otwarte PR.
+
+    Raises:
+        RuntimeError: Gdy nie udało się pobrać danych z Bitbucket.
+    """
+    client = platform._client
+
+    base = platform.api_prs_url
+
+    data = _fetch_page(client, base, timeout)
+    yield from map(platform.parse_pr, _page_values(data))
+
+    next_url = data.get("next")
+    while next_url:
+        data = _fetch_page(client, next_url, timeout)
+        yield from map(platform.parse_pr, _page_values(data))
         next_url = data.get("next")
-        if next_url:
-            url = next_url
-            continue
-
-        is_last_page = data.get("isLastPage")
-        if is_last_page is False:
-            next_start = data.get("nextPageStart")
-            if next_start is not None:
-                base = platform.get_api_prs_url()
-                url = f"{base}&start={next_start}"
-                continue
-
-        break
-
-    # Parsowanie do PullRequest
-    return [platform.parse_pr(raw) for raw in raw_prs]
+
+    if data.get("isLastPage") is False and data.get("nextPageStart") is not None:
+        for page in _fetch_offset_pages(client, base, timeout, data):
+            yield from map(platform.parse_pr, _page_values(page))
+
+
+def get_pull_requests(platform: BitbucketPlatform, *, timeout: int = 10) -> list[PullRequest]:
+    """Zwraca listę otwartych PR jako obiekty PullRequest.
+
+    Args:
+        platform: Obiekt platformy Bitbucket.
+        timeout: Limit czasu żądania HTTP w sekundach.
+
+    Returns:
+        Lista obiektów PullRequest reprezentujących otwarte PR.
+
+    Raises:
+        RuntimeError: Gdy nie udało się pobrać danych z Bitbucket.
+    """
+    return list(iter_pull_requests(platform, timeout=timeout))
@@ -1,29 +1,32 @@
-"""Główny moduł aplikacji Deployment Manager."""
+"""Główny moduł aplikacji Deployment Manager.
+
+Moduły logiki, Bitbucket i SSH (fabric, saspy, requests) importowane są dopiero
+w miejscu użycia, aby `--help` i błędy argumentów nie wymagały ich ładowania.
+"""
+from __future__ import annotations
+
 import argparse
+from contextlib import closing, nullcontext
 from datetime import datetime
 import sys
 import tempfile
 import uuid
 from pathlib import Path
-from typing import Any, Callable, cast, Tuple, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, cast, Tuple, Optional, Union
 
-from .bitbucket import BitbucketPlatform, create_platform
 from .config import Config
 from .constants import DEPLOY_DIR_PREFIX
 from .logger import error, info, ok, setup_logging, step, warn
-from .logic.pr_analysis import analyze_pull_requests, merge_local, merge_remote
-from .logic.packaging import build_package
-from .logic.metadata import export_metadata, import_metadata
-from .logic.predeploy import run_predeploy_bash, run_predeploy_sas
-from .logic.code_update import update_module_code
-from .logic.dictionaries import update_dictionaries
-from .logic.jobs import redeploy_jobs, report_deployed_flows
-from .remote.ssh_executor import RemotePath, SSHExecutor
 
-CONFIG_DIR_NAME = "configs"
+if TYPE_CHECKING:
+    from .mock import MockSSHExecutor
+    from .remote.ssh_executor import RemotePath, SSHExecutor
 
-# Type alias dla executora (prawdziwy lub mock)
-SSHExecutorType = Union[SSHExecutor, "MockSSHExecutor"]  # type: ignore
+    # Type alias dla executora (prawdziwy lub mock)
+    SSHExecutorType = Union[SSHExecutor, MockSSHExecutor]
+
+CONFIG_DIR_NAME = "configs"
+_CONFIG_PATH = Path(__file__).resolve().parents[2] / CONFIG_DIR_NAME
 
 
 def _run_step(func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> None:
@@ -94,6 +97,8 @@ def _setup_env(
     Raises:
         ValueError: Gdy DM_RUNTIME_BASE_DIR jest pusty lub nieprawidłowy.
     """
+    from .remote.ssh_executor import RemotePath, SSHExecutor
+
     ssh_user = cast(str, config.get("deploy_user"))
     ssh_host = cast(str, config.get("ssh_host"))
     ssh_executor = SSHExecutor(ssh_host, ssh_user)
@@ -121,16 +126,19 @@ def _setup_env(
     return ssh_executor, remote_work_dir
 
 
-def _setup_mock_env() -> Tuple["MockSSHExecutor", RemotePath]:  # type: ignore
+def _setup_mock_env() -> Tuple[MockSSHExecutor, RemotePath]:
     """Konfiguruje mockowe środowisko wykonawcze.
 
     Returns:
         Krotka (mockowy executor SSH, ścieżka do katalogu roboczego).
     """
     from .mock import MockSSHExecutor
+    from .remote.ssh_executor import RemotePath
 
     setup_logging()
-    info("[MOCK] Uruchamianie w trybie testowym")
+    info("=" * 60)
+    info("[MOCK] TRYB TESTOWY - operacje są symulowane")
+    info("=" * 60)
 
     # Tworzymy tymczasowy katalog lokalny
     mock_base = Path(tempfile.gettempdir()) / "dm_mock"
@@ -163,28 +171,43 @@ def _run_deployment_steps(
         remote_work_dir: Ścieżka do katalogu roboczego.
         mock_mode: Czy uruchamiać w trybie mock.
     """
+    from .bitbucket import BitbucketPlatform, create_platform
+    from .logic.code_update import clear_module_path_cache, update_module_code
+    from .logic.dictionaries import update_dictionaries
+    from .logic.jobs import redeploy_jobs, report_deployed_flows
+    from .logic.metadata import export_metadata, import_metadata
+    from .logic.packaging import build_package
+    from .logic.pr_analysis import analyze_pull_requests, merge_local, merge_remote
+    from .logic.predeploy import run_predeploy_bash, run_predeploy_sas
+    from .remote.sas_session import open_sas_session
+
     if mock_mode:
-        from .mock import MockBitbucketPlatform, get_mock_pull_requests
+        from .mock import MockBitbucketPlatform
 
         bitbucket_platform: BitbucketPlatform = MockBitbucketPlatform(args.repo)
-        prs = get_mock_pull_requests()
-        # Filtruj wg wymaganych akceptacji
-        required = cast(int, config.get("approvals", 0))
-        if required > 0:
-            prs = [pr for pr in prs if pr.approval_count >= required]
     else:
         bitbucket_platform = create_platform(config, args.repo)
-        prs = analyze_pull_requests(
+    with closing(bitbucket_platform):
+        if mock_mode:
+            from .mock import get_mock_pull_requests
+
+            prs = get_mock_pull_requests()
+            # Filtruj wg wymaganych akceptacji
+            required = cast(int, config.get("approvals", 0))
+            if required > 0:
+                prs = [pr for pr in prs if pr.approval_count >= required]
+        else:
+            prs = analyze_pull_requests(
+                platform=bitbucket_platform,
+                required_approvals=cast(int, config.get("approvals")),
+            )
+        changed_files, merged_locally = merge_local(
             platform=bitbucket_platform,
-            required_approvals=cast(int, config.get("approvals")),
+            ssh_executor=ssh_executor,
+            remote_work_dir=remote_work_dir,
+            git_executable=cast(str, config.get("remote_git_path")),
+            pull_requests=prs,
         )
-    changed_files, merged_locally = merge_local(
-        platform=bitbucket_platform,
-        ssh_executor=ssh_executor,
-        remote_work_dir=remote_work_dir,
-        git_executable=cast(str, config.get("remote_git_path")),
-        pull_requests=prs,
-    )
 
     if not changed_files:
         info("Brak zmian do wdrożenia.")
@@ -196,32 +219,48 @@ def _run_deployment_steps(
         changed_files=changed_files,
     )
     package_dir = remote_work_dir
+    clear_module_path_cache()
 
     step("Wykonywanie pre_deploy.sh")
     _run_step(run_predeploy_bash, package_dir=package_dir, ssh_executor=ssh_executor)
 
-    step("Wdrażanie kodu modułu")
-    _run_step(
-        update_module_code,
-        package_dir=package_dir,
-        env=args.env,
-        repo=args.repo,
-        ssh_executor=ssh_executor,
-    )
+    sas_scope = nullcontext(None) if mock_mode else open_sas_session(args.env)
+    with sas_scope as sas_session:
+        step("Wdrażanie kodu modułu")
+        _run_step(
+            update_module_code,
+            package_dir=package_dir,
+            env=args.env,
+            repo=args.repo,
+            ssh_executor=ssh_executor,
+            sas_session=sas_session,
+        )
 
-    step("Importowanie słowników MDS")
-    if mock_mode:
-        info("[MOCK] Pomijanie aktualizacji słowników MDS (wymaga SAS)")
-        ok("Krok pominięty")
-    else:
-        _run_step(update_dictionaries, package_dir=package_dir, env=args.env, ssh_executor=ssh_executor)
+        step("Importowanie słowników MDS")
+        if mock_mode:
+            info("[MOCK] Pomijanie aktualizacji słowników MDS (wymaga SAS)")
+            ok("Krok pominięty")
+        else:
+            _run_step(
+                update_dictionaries,
+                package_dir=package_dir,
+                env=args.env,
+                ssh_executor=ssh_executor,
+                sas_session=sas_session,
+            )
 
-    step("Wykonywanie pre_deploy.sas")
-    if mock_mode:
-        info("[MOCK] Pomijanie pre_deploy.sas (wymaga SAS)")
-        ok("Krok pominięty")
-    else:
-        _run_step(run_predeploy_sas, package_dir=package_dir, env=args.env, ssh_executor=ssh_executor)
+        step("Wykonywanie pre_deploy.sas")
+        if mock_mode:
+            info("[MOCK] Pomijanie pre_deploy.sas (wymaga SAS)")
+            ok("Krok pominięty")
+        else:
+            _run_step(
+                run_predeploy_sas,
+                package_dir=package_dir,
+                env=args.env,
+                ssh_executor=ssh_executor,
+                sas_session=sas_session,
+            )
 
     step("Eksportowanie metadanych")
     _run_step(export_metadata, package_dir=package_dir, config=config, ssh_executor=ssh_executor)
@@ -243,8 +282,8 @@ def _run_deployment_steps(
             info("Brak pull requestów do scalenia po wdrożeniu.")
         else:
             step("Scalanie pull requestów w Bitbucket po wdrożeniu")
-            platform = create_platform(config, args.repo)
-            _run_step(merge_remote, platform, merged_locally)
+            with closing(create_platform(config, args.repo)) as platform:
+                _run_step(merge_remote, platform, merged_locally)
 
 
 def main() -> None:
@@ -253,32 +292,18 @@ def main() -> None:
     mock_mode = args.mock
 
     remote_work_dir: Optional[RemotePath] = None
+    ssh_executor: Optional[SSHExecutorType] = None
     success = False
 
     try:
         if mock_mode:
-            from .mock import MockSSHExecutor
-
-            setup_logging()
-            info("="*60)
-            info("[MOCK] TRYB TESTOWY - operacje są symulowane")
-            info("="*60)
-
             # Wczytaj i zwaliduj konfigurację jak w prawdziwym trybie
-            config_path = Path(__file__).resolve().parents[2] / CONFIG_DIR_NAME
-            config = Config(config_path, args.env)
-
-            mock_base = Path(tempfile.gettempdir()) / "dm_mock"
-            ssh_executor: SSHExecutorType = MockSSHExecutor(mock_base)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            remote_work_dir = RemotePath(
-                f"/mock_runtime/{DEPLOY_DIR_PREFIX}{timestamp}_{uuid.uuid4()}"
-            )
-            ssh_executor.mkdir(remote_work_dir)
+            config = Config(_CONFIG_PATH, args.env)
+            config.validate()
+            ssh_executor, remote_work_dir = _setup_mock_env()
         else:
-            config_path = Path(__file__).resolve().parents[2] / CONFIG_DIR_NAME
-            config = Config(config_path, args.env)
+            config = Config(_CONFIG_PATH, args.env)
+            config.validate()
             ssh_executor, remote_work_dir = _setup_env(config)
 
         _run_deployment_steps(args, config, ssh_executor, remote_work_dir, mock_mode=mock_mode)
@@ -290,6 +315,8 @@ def main() -> None:
             info("Wdrożenie zakończone pomyślnie")
         else:
             error("Wdrożenie zakończone niepowodzeniem")
+        if ssh_executor is not None:
+            ssh_executor.close_all()
         if remote_work_dir is not None:
             if mock_mode:
                 mock_local_path = Path(tempfile.gettempdir()) / "dm_mock" / str(remote_work_dir).lstrip("/")
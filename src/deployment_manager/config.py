@@ -4,10 +4,34 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from .logger import error
 
+try:
+    import orjson
+
+    _json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_ENV_CACHE: dict[str, str | None] = {}
+
+
+def _cached_env(name: str) -> str | None:
+    """Zwraca wartość zmiennej środowiskowej, odczytaną raz na proces.
+
+    Args:
+        name: Nazwa zmiennej środowiskowej.
+
+    Returns:
+        Wartość zmiennej lub None, gdy nie jest ustawiona.
+    """
+    try:
+        return _ENV_CACHE[name]
+    except KeyError:
+        return _ENV_CACHE.setdefault(name, os.environ.get(name))
+
 
 class Config:
     """Zarządza konfiguracją, łącząc ustawienia z plików JSON.
@@ -45,60 +69,114 @@ class Config:
     def __init__(self, config_dir: Path, env: str):
         """Inicjalizuje konfigurację z plików JSON.
 
+        Pliki są wczytywane leniwie - warstwa jest parsowana dopiero wtedy,
+        gdy szukany klucz nie został znaleziony w warstwach o wyższym
+        priorytecie. Pełną walidację wykonuje `validate()`.
+
         Args:
             config_dir: Ścieżka do katalogu z plikami konfiguracyjnymi.
             env: Nazwa środowiska (np. 'dev', 'prod').
-
-        Raises:
-            ValueError: Gdy brakuje wymaganych kluczy lub są puste.
         """
-        self._config: dict[str, Any] = {}
-        self._load_config(config_dir, "common")
-        self._load_config(config_dir, env.lower())
-        self._load_config(config_dir, "local")
+        self._layer_paths: list[Path] = [
+            config_dir / f"{name}.json" for name in ("local", env.lower(), "common")
+        ]
+        self._layers: list[dict[str, Any] | None] = [None] * len(self._layer_paths)
+        self._overrides: dict[str, Any] = {}
         self._load_token_from_env()
-        self._validate_schema()
 
-    def _load_config(self, config_dir: Path, name: str) -> None:
+    def _load_config(self, config_file: Path) -> dict[str, Any]:
         """Wczytuje plik konfiguracyjny JSON.
 
         Args:
-            config_dir: Ścieżka do katalogu z plikami konfiguracyjnymi.
-            name: Nazwa pliku (bez rozszerzenia).
+            config_file: Ścieżka do pliku konfiguracyjnego.
+
+        Returns:
+            Słownik z zawartością pliku lub pusty słownik, gdy pliku nie
+            udało się wczytać.
         """
-        config_file = config_dir / f"{name}.json"
         if not config_file.is_file():
-            if name == "local":
-                return
-            error(f"Plik konfiguracyjny '{config_file}' nie został znaleziony.")
-            return
+            if config_file.stem != "local":
+                error(f"Plik konfiguracyjny '{config_file}' nie został znaleziony.")
+            return {}
 
         try:
-            with config_file.open("r", encoding="utf-8") as handle:
-                data = json.load(handle)
-                if not isinstance(data, dict):
-                    raise ValueError(
-                        f"Plik '{config_file}' nie zawiera obiektu JSON typu dict."
-                    )
-                self._config.update(data)
-        except (json.JSONDecodeError, ValueError) as e:
+            data = _json_loads(config_file.read_bytes())
+            if not isinstance(data, dict):
+                raise ValueError(
+                    f"Plik '{config_file}' nie zawiera obiektu JSON typu dict."
+                )
+            return data
+        except ValueError as e:
             error(f"Błąd podczas wczytywania pliku '{config_file}': {e}")
         except OSError as e:
             error(f"Nie można wczytać konfiguracji z '{config_file}': {e}")
+        return {}
+
+    def _layer(self, index: int) -> dict[str, Any]:
+        """Zwraca warstwę konfiguracji, wczytując plik przy pierwszym użyciu.
+
+        Args:
+            index: Indeks warstwy w `_layer_paths`.
+
+        Returns:
+            Słownik z kluczami danej warstwy.
+        """
+        layer = self._layers[index]
+        if layer is None:
+            layer = self._layers[index] = self._load_config(self._layer_paths[index])
+        return layer
+
+    def _iter_layers(self) -> Iterator[dict[str, Any]]:
+        """Zwraca warstwy konfiguracji od najwyższego priorytetu.
+
+        Yields:
+            Kolejne warstwy; pliki wczytywane są dopiero przy przejściu do nich.
+        """
+        yield self._overrides
+        for index in range(len(self._layer_paths)):
+            yield self._layer(index)
+
+    def _merged(self) -> dict[str, Any]:
+        """Zwraca połączoną konfigurację ze wszystkich warstw.
+
+        Returns:
+            Słownik, w którym warstwy o wyższym priorytecie nadpisują niższe.
+        """
+        merged: dict[str, Any] = {}
+        for layer in reversed(list(self._iter_layers())):
+            merged.update(layer)
+        return merged
 
     def _load_token_from_env(self) -> None:
         """Wczytuje token Bitbucket z zmiennych środowiskowych i zapisuje go w konfiguracji."""
-        token = os.getenv("BITBUCKET_API_TOKEN")
+        token = _cached_env("BITBUCKET_API_TOKEN")
         if token:
-            self._config["bitbucket_api_token"] = token
+            self._overrides["bitbucket_api_token"] = token
 
-    def _validate_schema(self) -> None:
-        """Sprawdza, czy wszystkie wymagane klucze konfiguracyjne są obecne i niepuste."""
+    def validate(self) -> None:
+        """Wczytuje wszystkie warstwy i sprawdza wymagane klucze.
+
+        Raises:
+            ValueError: Gdy brakuje wymaganych kluczy lub są puste.
+        """
+        self._validate_schema(self._merged())
+
+    @staticmethod
+    def invalidate_env_cache() -> None:
+        """Czyści zapamiętane wartości zmiennych środowiskowych."""
+        _ENV_CACHE.clear()
+
+    def _validate_schema(self, config: dict[str, Any]) -> None:
+        """Sprawdza, czy wszystkie wymagane klucze konfiguracyjne są obecne i niepuste.
+
+        Args:
+            config: Połączona konfiguracja ze wszystkich warstw.
+        """
         required_keys = set(self.BASE_REQUIRED_KEYS + self.ENV_REQUIRED_KEYS)
-        if "bitbucket_api_token" not in self._config:
+        if "bitbucket_api_token" not in config:
             required_keys.add("bitbucket_api_token")
 
-        missing_keys = required_keys - self._config.keys()
+        missing_keys = required_keys - config.keys()
         if missing_keys:
             raise ValueError(
                 "Brak wymaganych kluczy w konfiguracji: "
@@ -111,7 +189,7 @@ class Config:
 
         problematic_keys: set[str] = set()
         for key in keys_to_check:
-            value = self._config.get(key)
+            value = config.get(key)
             if value is None:
                 problematic_keys.add(key)
             elif key not in allowed_zero and value == "":
@@ -135,7 +213,10 @@ class Config:
         Returns:
             Wartość dla podanego klucza lub wartość domyślna.
         """
-        return self._config.get(key, default)
+        for layer in self._iter_layers():
+            if key in layer:
+                return layer[key]
+        return default
 
     def __contains__(self, key: str) -> bool:
         """Sprawdza czy klucz istnieje w konfiguracji.
@@ -146,7 +227,7 @@ class Config:
         Returns:
             True jeśli klucz istnieje, False w przeciwnym przypadku.
         """
-        return key in self._config
+        return any(key in layer for layer in self._iter_layers())
 
     def __repr__(self) -> str:
         """Zwraca reprezentację tekstową obiektu.
@@ -154,4 +235,4 @@ class Config:
         Returns:
             Reprezentacja tekstowa z listą kluczy.
         """
-        return f"Config(keys={list(self._config)})"
+        return f"Config(keys={list(self._merged())})"
@@ -1,12 +1,58 @@
 """Minimalny logger oparty o loguru."""
 from __future__ import annotations
 
-from typing import Iterable, Any
+from functools import lru_cache
+import signal
+from typing import Callable, Iterable, Any
 import sys
 from shutil import get_terminal_size
 from loguru import logger
 
-__all__ = ["info", "warn", "error", "setup_logging", "step", "ok", "list_block"]
+__all__ = [
+    "debug",
+    "info",
+    "warn",
+    "error",
+    "setup_logging",
+    "step",
+    "ok",
+    "list_block",
+    "list_block_lazy",
+    "on_terminal_resize",
+]
+
+_IS_TTY: bool = bool(getattr(sys.stdout, "isatty", None) and sys.stdout.isatty())
+_INFO_LEVEL_NO = 20
+_min_level_no = 0
+_RESIZE_CALLBACKS: list[Callable[[], None]] = []
+
+if _IS_TTY:
+    _STEP_FMT = "<magenta><b>▶ KROK</b></magenta> <white>{}</white>".format
+    _OK_FMT = "<green><b>✔ OK</b></green> <white>{}</white>".format
+    _HEADER_FMT = "<cyan><b>{}</b></cyan>".format
+    _ITEM_FMT = "<cyan>•</cyan> <white>{}</white>".format
+    _EMPTY_LIST = "<dim>(brak elementów)</dim>"
+else:
+    _STEP_FMT = "▶ KROK {}".format
+    _OK_FMT = "✔ OK {}".format
+    _HEADER_FMT = "{}".format
+    _ITEM_FMT = "• {}".format
+    _EMPTY_LIST = "(brak elementów)"
+
+
+def debug(msg: Any, *args: Any, **kwargs: Any) -> None:
+    """Loguje wiadomość na poziomie DEBUG.
+
+    Argumenty wstawiane są w miejsca `{}` dopiero, gdy wpis jest faktycznie
+    zapisywany, więc wywołania w gorących ścieżkach nic nie formatują przy
+    domyślnym poziomie INFO.
+
+    Args:
+        msg: Wiadomość do zalogowania (szablon str.format).
+        *args: Dodatkowe argumenty pozycyjne dla logowania.
+        **kwargs: Dodatkowe argumenty nazwane dla logowania.
+    """
+    logger.debug(msg, *args, **kwargs)
 
 
 def info(msg: Any, *args: Any, **kwargs: Any) -> None:
@@ -37,7 +83,36 @@ def _term_width(min_width: int = 60, max_width: int = 500) -> int:
     return max(min_width, min(width, max_width))
 
 
-def _rule(char: str = "─", color: str | None = None) -> str:
+@lru_cache(maxsize=1)
+def _cached_term_width() -> int:
+    """Zwraca szerokość terminala zapamiętaną na czas działania procesu.
+
+    Returns:
+        Szerokość terminala wyznaczona przez `_term_width`.
+    """
+    return _term_width()
+
+
+def on_terminal_resize(callback: Callable[[], None]) -> None:
+    """Rejestruje funkcję wywoływaną po zmianie rozmiaru terminala (SIGWINCH).
+
+    Args:
+        callback: Funkcja bez argumentów (np. `cache_clear` funkcji z lru_cache).
+    """
+    _RESIZE_CALLBACKS.append(callback)
+
+
+def _reset_term_width(*_: Any) -> None:
+    """Unieważnia zapamiętaną szerokość terminala (obsługa SIGWINCH)."""
+    _cached_term_width.cache_clear()
+    _rule_tty.cache_clear()
+    _rule_plain.cache_clear()
+    for callback in _RESIZE_CALLBACKS:
+        callback()
+
+
+@lru_cache(maxsize=16)
+def _rule_tty(char: str = "─", color: str | None = None) -> str:
     """Zwraca kolorowaną linię o szerokości terminala do separacji bloków.
 
     Args:
@@ -48,7 +123,25 @@ def _rule(char: str = "─", color: str | None = None) -> str:
         Sformatowana linia z kolorami.
     """
     c = color or "cyan"
-    return f"<{c}>{char * _term_width()}</{c}>"
+    return f"<{c}>{char * _cached_term_width()}</{c}>"
+
+
+@lru_cache(maxsize=16)
+def _rule_plain(char: str = "─", color: str | None = None) -> str:
+    """Zwraca linię separatora bez tagów kolorów (wyjście poza terminalem).
+
+    Args:
+        char: Znak używany do rysowania linii.
+        color: Ignorowany; zachowany dla zgodności z `_rule_tty`.
+
+    Returns:
+        Linia o szerokości terminala.
+    """
+    return char * _cached_term_width()
+
+
+_rule = _rule_tty if _IS_TTY else _rule_plain
+_raw = logger.opt(raw=True, colors=_IS_TTY)
 
 
 def step(message: str) -> None:
@@ -58,9 +151,9 @@ def step(message: str) -> None:
         message: Opis kroku do zalogowania.
     """
     top = _rule("─", "magenta")
-    line = f"<magenta><b>▶ KROK</b></magenta> <white>{message}</white>"
+    line = _STEP_FMT(message)
     bottom = _rule("─", "magenta")
-    logger.opt(raw=True, colors=True).info(f"\n{top}\n{line}\n{bottom}\n")
+    _raw.info(f"\n{top}\n{line}\n{bottom}\n")
 
 
 def ok(message: str) -> None:
@@ -69,9 +162,9 @@ def ok(message: str) -> None:
     Args:
         message: Opis zakończonego kroku.
     """
-    line = f"<green><b>✔ OK</b></green> <white>{message}</white>"
+    line = _OK_FMT(message)
     sep = _rule("─", "green")
-    logger.opt(raw=True, colors=True).info(f"{line}\n{sep}\n\n")
+    _raw.info(f"{line}\n{sep}\n\n")
 
 
 def warn(msg: Any, *args: Any, **kwargs: Any) -> None:
@@ -103,18 +196,22 @@ def list_block(header: str, items: Iterable[str]) -> None:
         header: Nagłówek listy.
         items: Elementy do wypisania.
     """
-    lines: list[str] = []
-    for it in items:
-        lines.append(f"<cyan>•</cyan> <white>{it}</white>")
-    if not lines:
-        lines.append("<dim>(brak elementów)</dim>")
-
+    body = "\n".join(map(_ITEM_FMT, items)) or _EMPTY_LIST
     top = _rule("─", "cyan")
     bottom = _rule("─", "cyan")
-    body = "\n".join(lines)
-    logger.opt(raw=True, colors=True).info(
-        f"\n{top}\n<cyan><b>{header}</b></cyan>\n\n{body}\n{bottom}\n\n"
-    )
+    _raw.info(f"\n{top}\n{_HEADER_FMT(header)}\n\n{body}\n{bottom}\n\n")
+
+
+def list_block_lazy(header: str, producer: Callable[[], Iterable[str]]) -> None:
+    """Jak list_block, ale elementy wyznacza dopiero, gdy poziom INFO jest logowany.
+
+    Args:
+        header: Nagłówek listy.
+        producer: Funkcja zwracająca elementy do wypisania (np. sortująca).
+    """
+    if _min_level_no > _INFO_LEVEL_NO:
+        return
+    list_block(header, producer())
 
 
 def _configure_level_colors() -> None:
@@ -136,16 +233,31 @@ def _console_format() -> str:
     )
 
 
-def setup_logging() -> None:
-    """Konfiguruje logowanie do stdout z czytelnym formatem."""
+def setup_logging(enqueue: bool = False, level: str = "INFO") -> None:
+    """Konfiguruje logowanie do stdout z czytelnym formatem.
+
+    Domyślnie wpisy zapisywane są synchronicznie - dla krótkiego uruchomienia
+    CLI kolejka i wątek pośredniczący loguru kosztują więcej niż zapis
+    bezpośredni. Dostęp do handlera jest chroniony blokadą, więc logowanie z
+    wątków (np. równoległy merge PR) pozostaje bezpieczne.
+
+    Args:
+        enqueue: Czy przekazywać wpisy przez kolejkę loguru (potrzebne przy
+            logowaniu z wielu procesów).
+        level: Minimalny poziom logowania (np. 'INFO', 'WARNING').
+    """
+    global _min_level_no
     logger.remove()
     _configure_level_colors()
     logger.add(
         sys.stdout,
-        level="INFO",
-        colorize=True,
+        level=level,
+        colorize=_IS_TTY,
         backtrace=True,
         diagnose=False,
         format=_console_format(),
-        enqueue=True,
+        enqueue=enqueue,
     )
+    _min_level_no = logger.level(level).no
+    if hasattr(signal, "SIGWINCH"):
+        signal.signal(signal.SIGWINCH, _reset_term_width)
@@ -1,14 +1,80 @@
 """Aktualizacja kodu modułu w lokalizacji wskazanej przez MDS.MODULY."""
 from __future__ import annotations
 
-from typing import Optional, cast
+from typing import TYPE_CHECKING, Optional, cast
 
 from ..constants import CODES_DIR_NAME, REPO_CODES_DIR_NAME, LOGS_DIR_NAME
 from ..logger import error, info
-from ..remote.sas_session import open_sas_session, submit_sas_code
+from ..remote.sas_session import submit_sas_code, use_sas_session
 from ..remote.ssh_executor import RemotePath, SSHExecutor, quote_shell
 
-__all__ = ["update_module_code"]
+if TYPE_CHECKING:
+    import saspy
+
+__all__ = ["update_module_code", "clear_module_path_cache"]
+
+
+_MODULE_PATH_CACHE: dict[tuple[str, str], str] = {}
+
+
+def clear_module_path_cache() -> None:
+    """Czyści zapamiętane ścieżki modułów odczytane z MDS.MODULY."""
+    _MODULE_PATH_CACHE.clear()
+
+
+def _sas_module_path(
+    env: str,
+    repo: str,
+    sas_session: saspy.SASsession | None,
+    ssh_executor: SSHExecutor,
+    package_dir: RemotePath,
+) -> str:
+    """Odczytuje i waliduje ścieżkę modułu z tabeli MDS.MODULY zapytaniem SAS.
+
+    Args:
+        env: Nazwa środowiska (np. 'dev', 'prod').
+        repo: Nazwa repozytorium/modułu.
+        sas_session: Wspólna sesja SAS; gdy None, otwierana jest nowa.
+        ssh_executor: Executor do wykonywania poleceń SSH.
+        package_dir: Ścieżka do katalogu pakietu na serwerze zdalnym.
+
+    Returns:
+        Ścieżka do modułu odczytana z tabeli MDS.MODULY.
+
+    Raises:
+        RuntimeError: Gdy ścieżka nie jest skonfigurowana w tabeli.
+        ValueError: Gdy odczytana ścieżka jest pusta.
+    """
+    with use_sas_session(env, sas_session) as session:
+        repo_lower = repo.lower()
+        sas_code = f"""
+            data _null_;
+                set MDS.MODULY(where=(lowcase(MODUL) = '{repo_lower}'));
+                call symputx('sciezka', trim(SCIEZKA_DO_MODULU));
+                stop;
+            run;
+        """
+        log_file = package_dir / LOGS_DIR_NAME / "get_module_path.log"
+        info("Wykonywanie zapytania SAS o ścieżkę modułu")
+        submit_sas_code(
+            sas_session=session,
+            ssh_executor=ssh_executor,
+            sas_code=sas_code,
+            log_file=log_file,
+        )
+
+        raw_value = cast(Optional[str], session.symget("sciezka"))  # type: ignore
+        if raw_value is None:
+            raise RuntimeError(
+                f"Brak skonfigurowanej ścieżki dla modułu {repo} "
+                "w tabeli MDS.MODULY."
+            )
+        cleaned_path = raw_value.strip()
+        if not cleaned_path:
+            raise ValueError(
+                f"Pusta ścieżka modułu {repo} pobrana z MDS.MODULY."
+            )
+        return cleaned_path
 
 
 def _get_module_path_from_sas(
@@ -16,14 +82,16 @@ def _get_module_path_from_sas(
     env: str,
     repo: str,
     ssh_executor: SSHExecutor,
+    sas_session: saspy.SASsession | None = None,
 ) -> str:
-    """Pobiera i waliduje ścieżkę modułu z tabeli MDS.MODULY.
+    """Pobiera ścieżkę modułu z MDS.MODULY, zapamiętując ją dla pary (env, repo).
 
     Args:
         package_dir: Ścieżka do katalogu pakietu na serwerze zdalnym.
         env: Nazwa środowiska (np. 'dev', 'prod').
         repo: Nazwa repozytorium/modułu.
         ssh_executor: Executor do wykonywania poleceń SSH.
+        sas_session: Wspólna sesja SAS; gdy None, otwierana jest nowa.
 
     Returns:
         Ścieżka do modułu odczytana z tabeli MDS.MODULY.
@@ -32,42 +100,20 @@ def _get_module_path_from_sas(
         RuntimeError: Gdy ścieżka nie jest skonfigurowana w tabeli.
         ValueError: Gdy odczytana ścieżka jest pusta.
     """
-    try:
-        with open_sas_session(env) as sas_session:
-            repo_lower = repo.lower()
-            sas_code = f"""
-                data _null_;
-                    set MDS.MODULY(where=(lowcase(MODUL) = '{repo_lower}'));
-                    call symputx('sciezka', trim(SCIEZKA_DO_MODULU));
-                    stop;
-                run;
-            """
-            log_file = package_dir / LOGS_DIR_NAME / "get_module_path.log"
-            info("Wykonywanie zapytania SAS o ścieżkę modułu")
-            submit_sas_code(
-                sas_session=sas_session,
-                ssh_executor=ssh_executor,
-                sas_code=sas_code,
-                log_file=log_file,
+    key = (env, repo.lower())
+    cleaned_path = _MODULE_PATH_CACHE.get(key)
+    if cleaned_path is None:
+        try:
+            cleaned_path = _sas_module_path(
+                env, repo, sas_session, ssh_executor, package_dir
             )
+        except Exception as exc:
+            error(f"Nie udało się pobrać ścieżki modułu. Szczegóły: {exc}.")
+            raise
+        _MODULE_PATH_CACHE[key] = cleaned_path
 
-            raw_value = cast(Optional[str], sas_session.symget("sciezka"))  # type: ignore
-            if raw_value is None:
-                raise RuntimeError(
-                    f"Brak skonfigurowanej ścieżki dla modułu {repo} "
-                    "w tabeli MDS.MODULY."
-                )
-            cleaned_path = raw_value.strip()
-            if not cleaned_path:
-                raise ValueError(
-                    f"Pusta ścieżka modułu {repo} pobrana z MDS.MODULY."
-                )
-
-            info(f"Pobrana ścieżka docelowa: {cleaned_path}")
-            return cleaned_path
-    except Exception as exc:
-        error(f"Nie udało się pobrać ścieżki modułu. Szczegóły: {exc}.")
-        raise
+    info(f"Pobrana ścieżka docelowa: {cleaned_path}")
+    return cleaned_path
 
 
 def update_module_code(
@@ -75,6 +121,7 @@ def update_module_code(
     env: str,
     repo: str,
     ssh_executor: SSHExecutor,
+    sas_session: saspy.SASsession | None = None,
 ) -> None:
     """Aktualizuje katalog kodu modułu według ścieżki z tabeli MDS.MODULY.
 
@@ -83,8 +130,11 @@ def update_module_code(
         env: Nazwa środowiska (np. 'dev', 'prod').
         repo: Nazwa repozytorium/modułu.
         ssh_executor: Executor do wykonywania poleceń SSH.
+        sas_session: Wspólna sesja SAS; gdy None, otwierana jest nowa.
     """
-    target_path_str = _get_module_path_from_sas(package_dir, env, repo, ssh_executor)
+    target_path_str = _get_module_path_from_sas(
+        package_dir, env, repo, ssh_executor, sas_session
+    )
 
     source_dir = package_dir / CODES_DIR_NAME / REPO_CODES_DIR_NAME
     if not ssh_executor.exists(source_dir):
@@ -97,11 +147,12 @@ def update_module_code(
     target_path = RemotePath(target_path_str)
     target_codes_dir = target_path / REPO_CODES_DIR_NAME
 
-    info(f"Usuwanie istniejącego katalogu '{target_codes_dir}'.")
-    ssh_executor.rmdir(target_codes_dir)
+    with ssh_executor.batch():
+        info(f"Usuwanie istniejącego katalogu '{target_codes_dir}'.")
+        ssh_executor.rmdir(target_codes_dir)
 
-    info(f"Kopiowanie '{source_dir}' do '{target_path}'.")
-    ssh_executor.run_command(
-        f"cp -r {quote_shell(str(source_dir))} {quote_shell(str(target_path))}"
-    )
+        info(f"Kopiowanie '{source_dir}' do '{target_path}'.")
+        ssh_executor.run_command(
+            f"cp -r {quote_shell(str(source_dir))} {quote_shell(str(target_path))}"
+        )
     info("Zakończono wdrażanie kodu modułu.")
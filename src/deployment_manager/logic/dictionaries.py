@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import re
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from invoke.exceptions import UnexpectedExit
 
 from ..remote.ssh_executor import RemotePath, SSHExecutor, quote_shell
-from ..remote.sas_session import open_sas_session, submit_sas_code
+from ..remote.sas_session import submit_sas_code, use_sas_session
 from ..constants import (
     CODES_DIR_NAME,
     EXTRA_FILES_DIR_NAME,
@@ -16,9 +16,26 @@ from ..constants import (
 )
 from ..logger import info, warn, error, list_block
 
+if TYPE_CHECKING:
+    import saspy
+
 __all__ = ["update_dictionaries"]
 
 _MDS_FILE_PATTERN: Final[re.Pattern[str]] = re.compile(r"(CRISPR-\d+)_mds\.txt")
+_FILE_SENTINEL: Final[str] = "\0FILE:"
+_CALL_FMT: Final = (
+    "%usr_zaktualizuj_slownik(slownik={d}, id_zadania={t}, srodowisko_docelowe={e});"
+).format
+_DATA_STEP_FMT: Final = """data _null_;
+    infile datalines dlm='|' truncover;
+    length slownik $256 id_zadania $32;
+    input slownik $ id_zadania $;
+    call execute(cats('%nrstr(%usr_zaktualizuj_slownik(slownik=', slownik,
+        ', id_zadania=', id_zadania, ', srodowisko_docelowe={env}));'));
+datalines;
+{rows}
+;
+run;""".format
 
 
 def _get_mds_files(
@@ -43,20 +60,60 @@ def _get_mds_files(
         ls_output = ssh_executor.run_command(
             f"ls -1 {quote_shell(str(extra_files_dir))}"
         )
-        all_files = ls_output.stdout.strip().split("\n")
-        return [f for f in all_files if _MDS_FILE_PATTERN.match(f)]
+        return [f for f in ls_output.stdout.splitlines() if _MDS_FILE_PATTERN.fullmatch(f)]
     except UnexpectedExit:
         warn(f"Nie udało się wylistować plików w {extra_files_dir}. Pomijanie.")
         return None
 
 
+def _read_mds_files(
+    ssh_executor: SSHExecutor, mds_files: list[str], extra_files_dir: RemotePath
+) -> dict[str, str]:
+    """Odczytuje zawartość plików _mds.txt jednym poleceniem zdalnym.
+
+    Każdy plik poprzedzony jest w wyjściu linią znacznika ze znakiem NUL, po
+    którym wyjście jest dzielone na zawartości poszczególnych plików.
+
+    Args:
+        ssh_executor: Executor do wykonywania poleceń SSH.
+        mds_files: Lista nazw plików _mds.txt.
+        extra_files_dir: Ścieżka do katalogu z plikami.
+
+    Returns:
+        Słownik nazwa pliku -> zawartość. Pliki, których nie udało się
+        odczytać, są w nim pominięte.
+    """
+    quoted = " ".join(quote_shell(f) for f in mds_files)
+    command = (
+        f"for f in {quoted}; do "
+        "if [ -r \"$f\" ]; then printf '\\0FILE:%s\\0\\n' \"$f\"; cat \"$f\"; fi; "
+        "done"
+    )
+    try:
+        result = ssh_executor.run_command(command, cwd=extra_files_dir)
+    except UnexpectedExit:
+        warn("Nie udało się odczytać plików _mds.txt jednym poleceniem.")
+        return {}
+
+    contents: dict[str, str] = {}
+    for chunk in result.stdout.split(_FILE_SENTINEL)[1:]:
+        filename, _, content = chunk.partition("\0\n")
+        contents[filename] = content
+    return contents
+
+
 def _generate_sas_calls(
     ssh_executor: SSHExecutor,
     mds_files: list[str],
     extra_files_dir: RemotePath,
     env: str,
-) -> list[str]:
-    """Generuje wywołania makr SAS na podstawie plików _mds.txt.
+) -> str:
+    """Generuje kod SAS wywołujący makro aktualizacji dla słowników z plików _mds.txt.
+
+    Zamiast osobnego wywołania makra dla każdego słownika generowany jest jeden
+    krok data, który wywołuje makro przez `call execute` dla każdego wiersza
+    sekcji datalines. %nrstr odkłada wykonanie makr do zakończenia kroku,
+    tak jak przy osobnych wywołaniach.
 
     Args:
         ssh_executor: Executor do wykonywania poleceń SSH.
@@ -65,38 +122,44 @@ def _generate_sas_calls(
         env: Nazwa środowiska docelowego.
 
     Returns:
-        Lista wywołań makr SAS.
+        Kod SAS do wykonania lub pusty string, gdy brak słowników.
     """
-    sas_calls: list[str] = []
+    rows: list[tuple[str, str]] = []
+    contents = _read_mds_files(ssh_executor, mds_files, extra_files_dir)
 
     for filename in mds_files:
-        match = _MDS_FILE_PATTERN.match(filename)
+        match = _MDS_FILE_PATTERN.fullmatch(filename)
         if not match:
             continue
         task_id = match.group(1)
         file_path = extra_files_dir / filename
         info(f"Przetwarzanie pliku: {filename}")
-        try:
-            content = ssh_executor.read_file(file_path)
-        except OSError as exc:
-            error(f"Nie udało się odczytać pliku {file_path}: {exc}. Pomijanie.")
-            continue
-        dictionaries = [line.strip() for line in content.split("\n") if line.strip()]
+        content = contents.get(filename)
+        if content is None:
+            try:
+                content = ssh_executor.read_file(file_path)
+            except OSError as exc:
+                error(f"Nie udało się odczytać pliku {file_path}: {exc}. Pomijanie.")
+                continue
+        dictionaries = [s for line in content.splitlines() if (s := line.strip())]
         if not dictionaries:
             info("  - Plik pusty, pomijanie.")
             continue
-        for dictionary in dictionaries:
-            call = (
-                f"%usr_zaktualizuj_slownik(slownik={dictionary}, id_zadania={task_id}, "
-                f"srodowisko_docelowe={env});"
-            )
-            sas_calls.append(call)
-    list_block("Wywołania makr SAS do wykonania:", sas_calls)
-    return sas_calls
+        rows.extend((d, task_id) for d in dictionaries)
+    list_block(
+        "Wywołania makr SAS do wykonania:",
+        [_CALL_FMT(d=d, t=t, e=env) for d, t in rows],
+    )
+    if not rows:
+        return ""
+    return _DATA_STEP_FMT(env=env, rows="\n".join(f"{d}|{t}" for d, t in rows))
 
 
 def update_dictionaries(
-    package_dir: RemotePath, env: str, ssh_executor: SSHExecutor
+    package_dir: RemotePath,
+    env: str,
+    ssh_executor: SSHExecutor,
+    sas_session: saspy.SASsession | None = None,
 ) -> None:
     """Aktualizuje słowniki MDS według plików CRISPR-*_mds.txt (poza DEV).
 
@@ -104,6 +167,7 @@ def update_dictionaries(
         package_dir: Ścieżka do katalogu pakietu.
         env: Nazwa środowiska (np. 'dev', 'prod').
         ssh_executor: Executor do wykonywania poleceń SSH.
+        sas_session: Wspólna sesja SAS; gdy None, otwierana jest nowa.
 
     Raises:
         RuntimeError: Gdy wystąpi błąd podczas aktualizacji słowników.
@@ -120,19 +184,18 @@ def update_dictionaries(
         info("Brak plików _mds.txt do przetworzenia.")
         return
 
-    sas_calls = _generate_sas_calls(ssh_executor, mds_files, extra_files_dir, env)
+    full_sas_code = _generate_sas_calls(ssh_executor, mds_files, extra_files_dir, env)
 
-    if not sas_calls:
+    if not full_sas_code:
         info("Nie wygenerowano wywołania makra.")
         return
 
-    full_sas_code = "\n".join(sas_calls)
     log_file = package_dir / LOGS_DIR_NAME / LOG_UPDATE_DICTIONARIES
     try:
-        with open_sas_session(env) as sas_session:
+        with use_sas_session(env, sas_session) as session:
             info("Wykonywanie skryptu aktualizacji słowników MDS")
             submit_sas_code(
-                sas_session=sas_session,
+                sas_session=session,
                 ssh_executor=ssh_executor,
                 sas_code=full_sas_code,
                 log_file=log_file,
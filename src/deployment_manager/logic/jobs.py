@@ -1,7 +1,9 @@
 """Wdrażanie (redeploy) jobów."""
 from __future__ import annotations
 
+from itertools import chain
 import re
+from typing import Final, Sequence
 
 from invoke.exceptions import UnexpectedExit
 
@@ -17,10 +19,17 @@ from ..logger import info, warn, error, list_block
 
 __all__ = ["redeploy_jobs", "report_deployed_flows"]
 
+_JOB_RE: Final[re.Pattern[str]] = re.compile(
+    r"^[ \t]*(.+?)[ \t]*\([ \t]*Job[ \t]*\)[ \t\r]*$", re.MULTILINE
+)
+_FLOW_RE: Final[re.Pattern[str]] = re.compile(
+    r"^[ \t]*(.+?)[ \t]*\([ \t]*DeployedFlow[ \t]*\)[ \t\r]*$", re.MULTILINE
+)
+
 
 def _get_job_names_from_meta_file(
     ssh_executor: SSHExecutor, meta_file: RemotePath
-) -> set[str]:
+) -> tuple[str, ...]:
     """Odczytuje i parsuje nazwy jobów z pliku meta.txt.
 
     Args:
@@ -28,46 +37,37 @@ def _get_job_names_from_meta_file(
         meta_file: Ścieżka do pliku meta.txt.
 
     Returns:
-        Zbiór nazw jobów znalezionych w pliku.
+        Posortowane, unikalne nazwy jobów znalezionych w pliku.
     """
     if not ssh_executor.exists(meta_file):
         info(f"Plik {META_FILE_NAME} nie znaleziony. Pomijanie.")
-        return set()
+        return ()
     try:
         content = ssh_executor.read_file(meta_file)
     except OSError:
         error(f"Nie udało się odczytać pliku {meta_file}. Pomijanie redeployu jobów.")
-        return set()
-
-    job_line_pattern = re.compile(r"^(.+?)\s*\(\s*Job\s*\)\s*$")
-    job_names: set[str] = set()
-    for raw_line in content.split("\n"):
-        line = raw_line.strip()
-        if not line:
-            continue
-        m = job_line_pattern.match(line)
-        if m:
-            job = m.group(1).strip()
-            job_names.add(job)
+        return ()
+
+    job_names = tuple(sorted({m.group(1).strip() for m in _JOB_RE.finditer(content)}))
 
     if job_names:
-        list_block("Znalezione joby do redeployu", sorted(job_names))
+        list_block("Znalezione joby do redeployu", job_names)
 
     return job_names
 
 
 def _write_jobs_to_redeploy_file(
-    ssh_executor: SSHExecutor, jobs_file: RemotePath, job_names: set[str]
+    ssh_executor: SSHExecutor, jobs_file: RemotePath, job_names: Sequence[str]
 ) -> None:
     """Zapisuje nazwy jobów do pliku na serwerze zdalnym.
 
     Args:
         ssh_executor: Executor do wykonywania poleceń SSH.
         jobs_file: Ścieżka do pliku wyjściowego.
-        job_names: Zbiór nazw jobów do zapisania.
+        job_names: Posortowane nazwy jobów do zapisania.
     """
-    jobs_content = "\n".join(sorted(job_names)) + "\n"
-    ssh_executor.write_file(jobs_file, jobs_content)
+    jobs_content = "\n".join(job_names) + "\n"
+    ssh_executor.write_file_bulk(jobs_file, jobs_content)
     info(f"Zapisano listę jobów ({len(job_names)}) do: {jobs_file}")
 
 
@@ -114,37 +114,35 @@ def _get_redeploy_config(config: Config) -> dict[str, str] | None:
 
 
 def _build_redeploy_command(
-    redeploy_config: dict[str, str], job_names: set[str], log_file: RemotePath
+    quoted_config: dict[str, str], job_names: Sequence[str], log_file: RemotePath
 ) -> str:
     """Buduje polecenie powłoki na podstawie konfiguracji i listy jobów.
 
     Args:
-        redeploy_config: Słownik z konfiguracją redeployu.
-        job_names: Zbiór nazw jobów do wdrożenia.
+        quoted_config: Konfiguracja redeployu z wartościami już zacytowanymi
+            przez `quote_shell`.
+        job_names: Posortowane nazwy jobów do wdrożenia.
         log_file: Ścieżka do pliku logu.
 
     Returns:
         Gotowe polecenie powłoki do wykonania.
     """
-    command_parts: list[str] = [
-        f"export DISPLAY={quote_shell(redeploy_config['display'])};",
-        quote_shell(redeploy_config["path_to_deployjobs"]),
+    command_parts = (
+        f"export DISPLAY={quoted_config['display']};",
+        quoted_config["path_to_deployjobs"],
         "-deploytype REDEPLOY",
-        f"-profile {quote_shell(redeploy_config['meta_profile'])}",
-        f"-metarepository {quote_shell(redeploy_config['meta_repo'])}",
-        f"-appservername {quote_shell(redeploy_config['appserver'])}",
-        f"-servermachine {quote_shell(redeploy_config['server_machine'])}",
-        f"-serverport {quote_shell(redeploy_config['server_port'])}",
-        f"-batchserver {quote_shell(redeploy_config['batch_server'])}",
-        f"-sourcedir {quote_shell(redeploy_config['deployed_jobs_dir'])}",
-        f"-deploymentdir {quote_shell(redeploy_config['deployed_jobs_dir'])}",
+        f"-profile {quoted_config['meta_profile']}",
+        f"-metarepository {quoted_config['meta_repo']}",
+        f"-appservername {quoted_config['appserver']}",
+        f"-servermachine {quoted_config['server_machine']}",
+        f"-serverport {quoted_config['server_port']}",
+        f"-batchserver {quoted_config['batch_server']}",
+        f"-sourcedir {quoted_config['deployed_jobs_dir']}",
+        f"-deploymentdir {quoted_config['deployed_jobs_dir']}",
         f"-log {quote_shell(str(log_file))}",
         "-objects",
-    ]
-
-    command_parts.extend(quote_shell(name) for name in sorted(job_names))
-
-    return " ".join(command_parts)
+    )
+    return " ".join(chain(command_parts, map(quote_shell, job_names)))
 
 
 def redeploy_jobs(
@@ -175,7 +173,8 @@ def redeploy_jobs(
     info(f"Ustawianie DISPLAY na {redeploy_config['display']} dla redeployu jobów")
 
     log_file = package_dir / LOGS_DIR_NAME / LOG_REDEPLOY_JOBS
-    command = _build_redeploy_command(redeploy_config, job_names, log_file)
+    quoted_config = {key: quote_shell(val) for key, val in redeploy_config.items()}
+    command = _build_redeploy_command(quoted_config, job_names, log_file)
 
     try:
         info("Uruchamianie polecenia redeployu jobów")
@@ -204,17 +203,9 @@ def report_deployed_flows(remote_work_dir: RemotePath, ssh_executor: SSHExecutor
     except OSError:
         return
 
-    pattern = re.compile(r"^(.+?)\s*\(\s*DeployedFlow\s*\)\s*$")
-    flows: set[str] = set()
-    for raw_line in content.split("\n"):
-        line = raw_line.strip()
-        if not line:
-            continue
-        match = pattern.match(line)
-        if match:
-            full_path = match.group(1).strip()
-            flows.add(full_path.rsplit("/", 1)[-1])
-
+    flows = sorted({
+        m.group(1).strip().rsplit("/", 1)[-1] for m in _FLOW_RE.finditer(content)
+    })
     if flows:
-        list_block("Następujące flowy zostały zmienione", sorted(flows))
+        list_block("Następujące flowy zostały zmienione", flows)
         warn("Upewnij się, że prawidłowe wersje znajdują się na serwerze LSF.")
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 
+from itertools import chain
 import re
+from typing import Final
+
 from invoke.exceptions import UnexpectedExit
 
 from ..config import Config
@@ -20,6 +23,10 @@ from ..remote.ssh_executor import SSHExecutor, RemotePath, quote_shell
 
 __all__ = ["export_metadata", "import_metadata"]
 
+_LOG_GREP_PATTERN: Final[str] = "^(ERROR|WARN)"
+_LOG_LEVEL_RE: Final[re.Pattern[str]] = re.compile(r"^(ERROR|WARN).*", re.MULTILINE)
+
+
 def _check_meta_logs(log_content: str) -> tuple[bool, bool]:
     """Analizuje treść logu exportu/importu w poszukiwaniu błędów i ostrzeżeń.
 
@@ -29,8 +36,10 @@ def _check_meta_logs(log_content: str) -> tuple[bool, bool]:
     Returns:
         Krotka (czy wystąpiły błędy, czy wystąpiły ostrzeżenia).
     """
-    error_lines = re.findall(r"^ERROR.*", log_content, flags=re.MULTILINE)
-    warning_lines = re.findall(r"^WARN.*", log_content, flags=re.MULTILINE)
+    error_lines: list[str] = []
+    warning_lines: list[str] = []
+    for m in _LOG_LEVEL_RE.finditer(log_content):
+        (error_lines if m.group(1) == "ERROR" else warning_lines).append(m.group(0))
     for line in error_lines:
         error(f"{line}")
     for line in warning_lines:
@@ -61,7 +70,7 @@ def export_metadata(
     except OSError as exc:
         error(f"Nie udało się odczytać pliku {meta_file}: {exc}. Pomijanie eksportu.")
         return
-    objects = [line.strip() for line in meta_content.splitlines() if line.strip()]
+    objects = [s for line in meta_content.splitlines() if (s := line.strip())]
     if not objects:
         warn("Plik meta.txt jest pusty. Pomijanie eksportu.")
         return
@@ -74,7 +83,7 @@ def export_metadata(
     spk_file = spk_dir / METADATA_SPK_NAME
     log_file = log_dir / LOG_METADATA_EXPORT
 
-    command_parts = [
+    command_parts = (
         quote_shell(str(export_tool)),
         "-disableX11",
         f"-profile {quote_shell(str(profile))}",
@@ -82,9 +91,8 @@ def export_metadata(
         f"-log {quote_shell(log_file)}",
         f"-subprop {quote_shell(subprop_file)}",
         "-objects",
-        *[quote_shell(obj) for obj in sorted(objects)],
-    ]
-    command = " ".join(command_parts)
+    )
+    command = " ".join(chain(command_parts, map(quote_shell, sorted(objects))))
 
     try:
         ssh_executor.run_command(command)
@@ -96,7 +104,7 @@ def export_metadata(
         )
         raise
 
-    log_content = ssh_executor.read_file(log_file)
+    log_content = ssh_executor.grep_lines(log_file, _LOG_GREP_PATTERN)
     has_error, has_warn = _check_meta_logs(log_content)
     if has_error:
         error(f"Wykryto błąd podczas eksportu, sprawdź {log_file}")
@@ -152,7 +160,7 @@ def import_metadata(
         )
         raise
 
-    log_content = ssh_executor.read_file(log_file)
+    log_content = ssh_executor.grep_lines(log_file, _LOG_GREP_PATTERN)
     has_error, has_warn = _check_meta_logs(log_content)
     if has_error:
         error(f"Wykryto błąd podczas importu, sprawdź {log_file}")
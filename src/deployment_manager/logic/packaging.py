@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
+from typing import Final
 
 from ..constants import (
     CODES_DIR_NAME,
@@ -14,29 +14,38 @@ from ..constants import (
     REMOTE_REPO_DIR_NAME,
     SPKS_DIR_NAME,
 )
-from ..logger import info, list_block
+from ..logger import info, list_block_lazy
 from ..remote.ssh_executor import RemotePath, SSHExecutor, quote_shell
 
 __all__ = ["build_package"]
 
+_MERGE_PREFIX: Final[str] = "CRISPR-"
+_MERGE_PATTERN: Final[re.Pattern[str]] = re.compile(r"^CRISPR-\d+_(.*)")
+_PRE_DEPLOY_SAS_HEADER: Final[str] = (
+    "printf '%s\\n' " + quote_shell(r"%let srodowisko = %sysget(srodowisko);") + "; "
+)
+_PRE_DEPLOY_BASH_HEADER: Final[str] = (
+    "printf '%s\\n' '#!/bin/bash'; printf '%s\\n' 'set -euo pipefail'; "
+)
+
 
-def _prepare_package_dirs(ssh_executor: SSHExecutor, package_dir: RemotePath) -> None:
-    """Tworzy strukturę katalogów pakietu wdrożeniowego na serwerze.
+def _prepare_package_dirs(package_dir: RemotePath) -> str:
+    """Zwraca komendę tworzącą strukturę katalogów pakietu wdrożeniowego.
 
     Args:
-        ssh_executor: Executor do wykonywania poleceń SSH.
         package_dir: Ścieżka do katalogu pakietu.
+
+    Returns:
+        Komenda shell do wykonania.
     """
-    info("Przygotowywanie struktury katalogów.")
-    dirs = {
-        "codes": package_dir / CODES_DIR_NAME,
-        "extra_files": package_dir / CODES_DIR_NAME / EXTRA_FILES_DIR_NAME,
-        "spks": package_dir / SPKS_DIR_NAME,
-        "logs": package_dir / LOGS_DIR_NAME,
-    }
-    for d in dirs.values():
-        ssh_executor.mkdir(RemotePath(d))
-    info("Struktura katalogów została utworzona.")
+    codes_dir = package_dir / CODES_DIR_NAME
+    dirs = (
+        codes_dir,
+        codes_dir / EXTRA_FILES_DIR_NAME,
+        package_dir / SPKS_DIR_NAME,
+        package_dir / LOGS_DIR_NAME,
+    )
+    return "mkdir -p " + " ".join(quote_shell(d) for d in dirs)
 
 
 def _copy_repo_codes_dir(
@@ -62,8 +71,11 @@ def _copy_extra_files(
     changed_files: set[str],
     remote_repo_dir: RemotePath,
     remote_extra_files_dir: RemotePath,
-) -> tuple[list[str], set[str]]:
-    """Przygotowuje komendy kopiowania dodatkowych plików i zwraca listę skopiowanych.
+) -> tuple[list[str], dict[str, list[RemotePath]], dict[RemotePath, str]]:
+    """Przygotowuje komendy kopiowania dodatkowych plików i wyznacza pliki do scalenia.
+
+    Pliki do scalenia identyfikowane są po wzorcu nazwy (CRISPR-<id>_<nazwa>)
+    w tym samym przebiegu co kopiowanie.
 
     Args:
         changed_files: Zbiór ścieżek zmienionych plików.
@@ -71,63 +83,49 @@ def _copy_extra_files(
         remote_extra_files_dir: Ścieżka do katalogu plików dodatkowych.
 
     Returns:
-        Krotka (lista komend kopiowania, zbiór skopiowanych plików).
+        Krotka (lista komend kopiowania, słownik mapujący nazwy docelowe na
+        listy skopiowanych plików do scalenia, słownik plik do scalenia ->
+        jego ścieżka zacytowana dla shell).
     """
-    script_commands: list[str] = []
-    extra_files_to_copy = {
-        f for f in changed_files if f.startswith(f"{EXTRA_FILES_DIR_NAME}/")
-    }
-
-    if not extra_files_to_copy:
+    prefix = f"{EXTRA_FILES_DIR_NAME}/"
+    sources: list[str] = []
+    files_to_merge: dict[str, list[RemotePath]] = {}
+    quoted: dict[RemotePath, str] = {}
+    for file_path_str in changed_files:
+        if not file_path_str.startswith(prefix):
+            continue
+        sources.append(quote_shell(remote_repo_dir / file_path_str))
+        filename = file_path_str.rsplit("/", 1)[-1]
+        if filename.startswith(_MERGE_PREFIX) and (
+            match := _MERGE_PATTERN.match(filename)
+        ):
+            destination = remote_extra_files_dir / filename
+            quoted[destination] = quote_shell(destination)
+            files_to_merge.setdefault(match.group(1), []).append(destination)
+
+    if not sources:
         info("Brak zmienionych plików w 'dodatkowe_pliki' do przetworzenia.")
-        return [], set()
+        return [], {}, {}
 
     info(
-        f"Kopiowanie {len(extra_files_to_copy)} zmienionych plików z "
+        f"Kopiowanie {len(sources)} zmienionych plików z "
         f"'{EXTRA_FILES_DIR_NAME}'."
     )
-    for file_path_str in extra_files_to_copy:
-        file_path = Path(file_path_str)
-        source = remote_repo_dir / file_path_str
-        destination = remote_extra_files_dir / file_path.name
-        script_commands.append(f"cp {quote_shell(source)} {quote_shell(destination)}")
-
-    return script_commands, extra_files_to_copy
-
-
-def _get_files_to_merge(
-    extra_files_to_copy: set[str], remote_extra_files_dir: RemotePath
-) -> dict[str, list[RemotePath]]:
-    """Identyfikuje pliki do scalenia na podstawie wzorca nazwy.
-
-    Args:
-        extra_files_to_copy: Zbiór ścieżek plików do skopiowania.
-        remote_extra_files_dir: Ścieżka do katalogu plików dodatkowych.
-
-    Returns:
-        Słownik mapujący nazwy docelowe na listy plików do scalenia.
-    """
-    files_to_merge: dict[str, list[RemotePath]] = {}
-    merge_pattern = re.compile(r"^CRISPR-\d+_(.*)")
+    copy_command = f"cp {' '.join(sources)} {quote_shell(remote_extra_files_dir)}/"
 
-    for file_path_str in extra_files_to_copy:
-        filename = Path(file_path_str).name
-        match = merge_pattern.match(filename)
-        if match:
-            target_name = match.group(1)
-            files_to_merge.setdefault(target_name, []).append(
-                remote_extra_files_dir / filename
-            )
-    return files_to_merge
+    return [copy_command], files_to_merge, quoted
 
 
 def _get_merge_commands(
-    files_to_merge: dict[str, list[RemotePath]], remote_work_dir: RemotePath
+    files_to_merge: dict[str, list[RemotePath]],
+    quoted: dict[RemotePath, str],
+    remote_work_dir: RemotePath,
 ) -> list[str]:
     """Generuje komendy bash do scalenia plików.
 
     Args:
         files_to_merge: Słownik plików do scalenia.
+        quoted: Zacytowane ścieżki plików do scalenia (z _copy_extra_files).
         remote_work_dir: Ścieżka do katalogu roboczego.
 
     Returns:
@@ -143,73 +141,58 @@ def _get_merge_commands(
 
     info("Przygotowywanie poleceń łączenia plików.")
     for target_name, source_files in files_to_merge.items():
-        ordered_sources = sorted(source_files, key=str)
+        ordered_sources = sorted(source_files) if len(source_files) > 1 else source_files
         target_file = remote_work_dir / target_name
-        list_block(f"Łączenie do {target_file}:", [str(f) for f in ordered_sources])
-
-        target_q = quote_shell(target_file)
-        cats = " ".join(
-            f"cat {quote_shell(src)}; printf '\\n';" for src in ordered_sources
+        list_block_lazy(
+            f"Łączenie do {target_file}:", lambda: map(str, ordered_sources)
         )
 
+        target_q = quote_shell(target_file)
+        parts = ["{ "]
         if target_name == PRE_DEPLOY_SCRIPT_NAME:
-            line_to_add = r"%let srodowisko = %sysget(srodowisko);"
-            cmd = (
-                "{ "
-                + "printf '%s\\n' "
-                + quote_shell(line_to_add)
-                + "; "
-                + cats
-                + f" }} > {target_q}"
-            )
-            script_commands.append(cmd)
+            parts.append(_PRE_DEPLOY_SAS_HEADER)
         elif target_name == PRE_DEPLOY_BASH_SCRIPT_NAME:
-            cmd_build = (
-                "{ "
-                "printf '%s\\n' '#!/bin/bash'; "
-                "printf '%s\\n' 'set -euo pipefail'; "
-                + cats
-                + f" }} > {target_q}"
-            )
-            script_commands.append(cmd_build)
+            parts.append(_PRE_DEPLOY_BASH_HEADER)
+        parts.extend(
+            f"cat {quoted[src]}; printf '\\n'; " for src in ordered_sources
+        )
+        parts.append(f"}} > {target_q}")
+        script_commands.append("".join(parts))
+        if target_name == PRE_DEPLOY_BASH_SCRIPT_NAME:
             script_commands.append(f"chmod +x {target_q}")
-        else:
-            cmd = "{ " + cats + f" }} > {target_q}"
-            script_commands.append(cmd)
     return script_commands
 
 
 def _copy_and_merge_files(
-    ssh_executor: SSHExecutor, changed_files: set[str], remote_work_dir: RemotePath
-) -> None:
-    """Kopiuje zmienione pliki i scala pliki CRISPR-*_*.txt do docelowych nazw.
+    changed_files: set[str], remote_work_dir: RemotePath
+) -> list[str]:
+    """Zwraca komendy kopiujące zmienione pliki i scalające pliki CRISPR-*_*.txt.
+
+    Gdy wśród zmian nie ma plików dodatkowych, zwracana jest tylko komenda
+    kopiowania katalogu kodów repozytorium.
 
     Args:
-        ssh_executor: Executor do wykonywania poleceń SSH.
         changed_files: Zbiór ścieżek zmienionych plików.
         remote_work_dir: Ścieżka do katalogu roboczego.
+
+    Returns:
+        Lista komend shell do wykonania.
     """
     remote_repo_dir = remote_work_dir / REMOTE_REPO_DIR_NAME
     remote_codes_dir = remote_work_dir / CODES_DIR_NAME
     remote_extra_files_dir = remote_codes_dir / EXTRA_FILES_DIR_NAME
 
-    all_commands: list[str] = []
-
-    all_commands.append(_copy_repo_codes_dir(remote_repo_dir, remote_codes_dir))
+    all_commands = [_copy_repo_codes_dir(remote_repo_dir, remote_codes_dir)]
 
-    copy_commands, copied_files = _copy_extra_files(
+    copy_commands, files_to_merge, quoted = _copy_extra_files(
         changed_files, remote_repo_dir, remote_extra_files_dir
     )
-    all_commands.extend(copy_commands)
-
-    files_to_merge = _get_files_to_merge(copied_files, remote_extra_files_dir)
-    merge_commands = _get_merge_commands(files_to_merge, remote_work_dir)
-    all_commands.extend(merge_commands)
-
-    if all_commands:
-        for cmd in all_commands:
-            ssh_executor.run_command(cmd)
-        info("Pliki zostały pomyślnie skopiowane i połączone.")
+    if copy_commands:
+        all_commands.extend(copy_commands)
+        all_commands.extend(
+            _get_merge_commands(files_to_merge, quoted, remote_work_dir)
+        )
+    return all_commands
 
 
 def build_package(
@@ -217,11 +200,19 @@ def build_package(
 ) -> None:
     """Buduje pakiet wdrożeniowy (struktura + kopiowanie/łączenie plików).
 
+    Tworzenie katalogów, kopiowanie i scalanie wykonywane są jednym skryptem
+    (set -e), czyli jednym wywołaniem zdalnym.
+
     Args:
         changed_files: Zbiór ścieżek zmienionych plików.
         ssh_executor: Executor do wykonywania poleceń SSH.
         remote_work_dir: Ścieżka do katalogu roboczego.
     """
     info(f"Tworzenie struktury wdrożeniowej: {remote_work_dir}.")
-    _prepare_package_dirs(ssh_executor, remote_work_dir)
-    _copy_and_merge_files(ssh_executor, changed_files, remote_work_dir)
+    commands = [
+        _prepare_package_dirs(remote_work_dir),
+        *_copy_and_merge_files(changed_files, remote_work_dir),
+    ]
+    script = "\n".join(["set -e", *commands])
+    ssh_executor.run_command(script, cwd=remote_work_dir)
+    info("Struktura katalogów została utworzona, pliki skopiowane i połączone.")
@@ -1,19 +1,29 @@
 """Analiza i scalanie pull requestów oraz zbieranie zmienionych plików."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from invoke.exceptions import UnexpectedExit
+from paramiko.ssh_exception import SSHException
 
-from ..bitbucket import BitbucketPlatform, get_pull_requests, PullRequest
+from ..bitbucket import BitbucketPlatform, iter_pull_requests, PullRequest
 from ..constants import REMOTE_REPO_DIR_NAME
-from ..logger import info, warn, error, list_block
+from ..logger import info, warn, error, list_block_lazy
 from ..remote.ssh_executor import SSHExecutor, RemotePath, quote_shell
 
 __all__ = ["analyze_pull_requests", "merge_local", "merge_remote"]
 
+_API_WORKERS = 8
+_ANALYZE_WORKERS = 4
+
 
 def merge_remote(platform: BitbucketPlatform, prs: list[PullRequest]) -> None:
     """Scala podane PRy w Bitbucket.
 
+    PR scalane są kolejno w kolejności id (tak jak zostały scalone lokalnie);
+    pierwszy błąd przerywa scalanie. Wszystkie żądania korzystają ze wspólnej
+    sesji HTTP platformy.
+
     Args:
         platform: Obiekt platformy Bitbucket.
         prs: Lista obiektów PullRequest do scalenia.
@@ -52,7 +62,7 @@ def _clone_repo(
         git_executable: Ścieżka do pliku wykonywalnego git.
     """
     info("Klonowanie repozytorium na serwerze zdalnym.")
-    clone_url = platform.get_clone_url()
+    clone_url = platform.clone_url
     clone_cmd = " ".join([
         f"{git_executable}",
         "clone",
@@ -63,13 +73,62 @@ def _clone_repo(
     ])
     ssh_executor.run_command(clone_cmd, cwd=remote_work_dir)
 
+def _fetch_branches(
+    ssh_executor: SSHExecutor,
+    repo_dir: RemotePath,
+    git_executable: str,
+    branches: list[str],
+) -> set[str]:
+    """Pobiera podane gałęzie i zwraca te, które udało się pobrać.
+
+    Wszystkie gałęzie pobierane są najpierw jednym poleceniem git fetch. Gdy
+    się ono nie powiedzie (np. gałąź źródłowa któregoś PR została usunięta),
+    gałęzie pobierane są kolejno pojedynczo, a niedostępne są pomijane.
+
+    Args:
+        ssh_executor: Executor do wykonywania poleceń SSH.
+        repo_dir: Ścieżka do katalogu repozytorium.
+        git_executable: Ścieżka do pliku wykonywalnego git.
+        branches: Nazwy gałęzi do pobrania.
+
+    Returns:
+        Zbiór nazw gałęzi pobranych z origin.
+    """
+    unique = list(dict.fromkeys(branches))
+    quoted = " ".join(quote_shell(b) for b in unique)
+    try:
+        ssh_executor.run_command(
+            f"{git_executable} fetch -q origin {quoted}",
+            cwd=repo_dir,
+            suppress_error_print=True,
+        )
+        return set(unique)
+    except UnexpectedExit:
+        warn("Zbiorcze pobranie gałęzi nie powiodło się. Pobieranie pojedynczo.")
+
+    fetched: set[str] = set()
+    for branch in unique:
+        try:
+            ssh_executor.run_command(
+                f"{git_executable} fetch -q origin {quote_shell(branch)}", cwd=repo_dir
+            )
+        except UnexpectedExit:
+            error(f"Nie udało się pobrać gałęzi '{branch}'.")
+            continue
+        fetched.add(branch)
+    return fetched
+
+
 def _collect_changed_files_for_branch(
     ssh_executor: SSHExecutor, repo_dir: RemotePath, git_executable: str, branch: str
 ) -> set[str]:
     """Zwraca zbiór plików zmienionych między HEAD a origin/branch.
 
     Wykorzystuje git diff z wykrywaniem przeniesień/kopii (-M -C) i filtruje
-    na typy A/M/R/C.
+    na typy A/M/R/C. Merge-base i diff wykonywane są jednym poleceniem
+    zdalnym; gałąź musi być wcześniej pobrana przez `_fetch_branches`.
+    Polecenie tylko czyta repozytorium, więc może działać równolegle dla
+    wielu gałęzi.
 
     Args:
         ssh_executor: Executor do wykonywania poleceń SSH.
@@ -81,15 +140,11 @@ def _collect_changed_files_for_branch(
         Zbiór ścieżek zmienionych plików.
     """
     changed: set[str] = set()
-    ssh_executor.run_command(f"{git_executable} fetch origin {quote_shell(branch)}", cwd=repo_dir)
-    merge_base_out = ssh_executor.run_command(
-        f"{git_executable} merge-base HEAD {quote_shell(f'origin/{branch}')} ",
-        cwd=repo_dir,
-    )
-    merge_base = merge_base_out.stdout.strip().splitlines()[0]
+    branch_ref = quote_shell(f"origin/{branch}")
     diff_cmd = (
-        f"{git_executable} diff -M -C --name-status --diff-filter=ACMR "
-        + quote_shell(f"{merge_base}..origin/{branch}")
+        f"MB=$({git_executable} merge-base HEAD {branch_ref})"
+        f" && {git_executable} diff -M -C --name-status --diff-filter=ACMR"
+        f" \"$MB\"..{branch_ref}"
     )
     diff_out = ssh_executor.run_command(diff_cmd, cwd=repo_dir)
     for line in diff_out.stdout.strip().splitlines():
@@ -104,6 +159,7 @@ def _collect_changed_files_for_branch(
             changed.add(parts[2])
     return changed
 
+
 def _collect_pr_changes(
     platform: BitbucketPlatform,
     ssh_executor: SSHExecutor,
@@ -113,6 +169,14 @@ def _collect_pr_changes(
 ) -> tuple[set[str], list[tuple[PullRequest, str]]]:
     """Zbiera zmienione pliki i listę (PR, gałąź) dla późniejszego scalania.
 
+    Najpierw dla wszystkich PR pytane jest API Bitbucket (współbieżnie, tylko
+    HTTP). Gałęzie PR, dla których API nie zwróciło pełnych danych, pobierane
+    są przez `_fetch_branches`, a następnie równolegle analizowane tylko do
+    odczytu (merge-base + diff) w osobnych kanałach SSH. PR, których gałęzi
+    nie udało się pobrać lub przeanalizować, są pomijane z błędem w logu. Liczba równoległych kanałów
+    (`_ANALYZE_WORKERS`) zostawia zapas względem typowego MaxSessions serwera
+    (10) na trwałą powłokę i kanał SFTP głównego executora.
+
     Args:
         platform: Obiekt platformy Bitbucket.
         ssh_executor: Executor do wykonywania poleceń SSH.
@@ -126,22 +190,68 @@ def _collect_pr_changes(
     changed_files: set[str] = set()
     pr_branch_pairs: list[tuple[PullRequest, str]] = []
 
+    candidates: list[tuple[PullRequest, str]] = []
     for pr in active_prs:
         branch = pr.source_branch
         if not branch:
             warn(f"Brak gałęzi dla PR #{pr.id} - pomijanie.")
             continue
         info(f"Analizowanie PR #{pr.id}: {pr.title} ({branch})")
-        try:
-            branch_changed = _collect_changed_files_for_branch(
-                ssh_executor, remote_repo_dir, git_executable, branch
-            )
-            list_block(f"Pliki w PR #{pr.id} ({branch}):", sorted(branch_changed))
-            changed_files.update(branch_changed)
-            pr_branch_pairs.append((pr, branch))
-        except UnexpectedExit:
-            error(f"Analiza zmian PR #{pr.id} ({branch}) nie powiodła się.")
+        candidates.append((pr, branch))
+
+    if not candidates:
+        return changed_files, pr_branch_pairs
+
+    with ThreadPoolExecutor(max_workers=min(_API_WORKERS, len(candidates))) as executor:
+        api_results = list(
+            executor.map(platform.get_pr_changed_files, [pr for pr, _ in candidates])
+        )
+
+    results: dict[int, set[str]] = {
+        pr.id: changed
+        for (pr, _), changed in zip(candidates, api_results)
+        if changed is not None
+    }
+    git_candidates = [(pr, b) for pr, b in candidates if pr.id not in results]
+    if git_candidates:
+        fetched = _fetch_branches(
+            ssh_executor, remote_repo_dir, git_executable, [b for _, b in git_candidates]
+        )
+        for pr, branch in git_candidates:
+            if branch not in fetched:
+                error(f"Analiza zmian PR #{pr.id} ({branch}) nie powiodła się.")
+        git_candidates = [(pr, b) for pr, b in git_candidates if b in fetched]
+
+    if git_candidates:
+        workers = min(_ANALYZE_WORKERS, len(git_candidates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _collect_changed_files_for_branch,
+                    ssh_executor.open_channel(),
+                    remote_repo_dir,
+                    git_executable,
+                    branch,
+                )
+                for _, branch in git_candidates
+            ]
+        for (pr, branch), future in zip(git_candidates, futures):
+            try:
+                results[pr.id] = future.result()
+            except UnexpectedExit:
+                error(f"Analiza zmian PR #{pr.id} ({branch}) nie powiodła się.")
+            except (SSHException, OSError) as exc:
+                error(f"Analiza zmian PR #{pr.id} ({branch}) nie powiodła się: {exc}")
+
+    for pr, branch in candidates:
+        branch_changed = results.get(pr.id)
+        if branch_changed is None:
             continue
+        list_block_lazy(
+            f"Pliki w PR #{pr.id} ({branch}):", lambda: sorted(branch_changed)
+        )
+        changed_files.update(branch_changed)
+        pr_branch_pairs.append((pr, branch))
 
     return changed_files, pr_branch_pairs
 
@@ -158,11 +268,11 @@ def _merge_pull_requests(
         ssh_executor: Executor do wykonywania poleceń SSH.
         remote_repo_dir: Ścieżka do katalogu repozytorium.
         git_executable: Ścieżka do pliku wykonywalnego git.
-        pr_branch_pairs: Lista par (PR, nazwa gałęzi) do scalenia.
+        pr_branch_pairs: Lista par (PR, nazwa gałęzi) do scalenia, w kolejności id PR.
     """
     info(f"Scalanie {len(pr_branch_pairs)} PR.")
 
-    for pr, branch in sorted(pr_branch_pairs, key=lambda x: x[0].id):
+    for pr, branch in pr_branch_pairs:
         info(f"Scalanie PR #{pr.id}: {pr.title} ({branch})")
         try:
             ssh_executor.run_command(
@@ -199,16 +309,21 @@ def analyze_pull_requests(
         required_approvals: Minimalna wymagana liczba akceptacji.
 
     Returns:
-        Lista obiektów PullRequest spełniających kryteria.
+        Lista obiektów PullRequest spełniających kryteria, posortowana po id.
     """
     info(f"Sprawdzanie pull requestów: {platform.repo}")
-    prs = get_pull_requests(platform)
-    if not prs:
+    open_count = 0
+    prs: list[PullRequest] = []
+    for pr in iter_pull_requests(platform):
+        open_count += 1
+        if pr.approval_count >= required_approvals:
+            prs.append(pr)
+
+    if not open_count:
         info("Brak aktywnych pull requestów.")
         return []
 
     if required_approvals > 0:
-        prs = [pr for pr in prs if pr.approval_count >= required_approvals]
         if not prs:
             info(
                 "Brak PR spełniających wymóg akceptacji "
@@ -219,6 +334,7 @@ def analyze_pull_requests(
             f"PR po odfiltrowaniu (>= {required_approvals} akceptacji): {len(prs)}"
         )
     info(f"Znaleziono {len(prs)} pull requestów do analizy.")
+    prs.sort()
     return prs
 
 
@@ -236,7 +352,7 @@ def merge_local(
         ssh_executor: Executor do wykonywania poleceń SSH.
         remote_work_dir: Ścieżka do katalogu roboczego na serwerze.
         git_executable: Ścieżka do pliku wykonywalnego git.
-        pull_requests: Lista PR do scalenia.
+        pull_requests: Lista PR do scalenia, posortowana po id.
 
     Returns:
         Krotka (zbiór zmienionych plików, lista scalonych PR).
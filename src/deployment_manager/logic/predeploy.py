@@ -1,6 +1,8 @@
 """Operacje pre_deploy: uruchamianie skryptów bash oraz SAS."""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from invoke.exceptions import UnexpectedExit
 
 from ..constants import (
@@ -11,9 +13,12 @@ from ..constants import (
     PRE_DEPLOY_SCRIPT_NAME,
 )
 from ..logger import info, error
-from ..remote.sas_session import open_sas_session, submit_sas_code
+from ..remote.sas_session import submit_sas_code, use_sas_session
 from ..remote.ssh_executor import SSHExecutor, RemotePath, quote_shell
 
+if TYPE_CHECKING:
+    import saspy
+
 __all__ = ["run_predeploy_bash", "run_predeploy_sas"]
 
 
@@ -49,7 +54,10 @@ def run_predeploy_bash(package_dir: RemotePath, ssh_executor: SSHExecutor) -> No
 
 
 def run_predeploy_sas(
-    package_dir: RemotePath, env: str, ssh_executor: SSHExecutor
+    package_dir: RemotePath,
+    env: str,
+    ssh_executor: SSHExecutor,
+    sas_session: saspy.SASsession | None = None,
 ) -> None:
     """Uruchamia pre_deploy.sas przez saspy ustawiając &srodowisko.
 
@@ -57,6 +65,7 @@ def run_predeploy_sas(
         package_dir: Ścieżka do katalogu pakietu.
         env: Nazwa środowiska (np. 'dev', 'prod').
         ssh_executor: Executor do wykonywania poleceń SSH.
+        sas_session: Wspólna sesja SAS; gdy None, otwierana jest nowa.
 
     Raises:
         Exception: Gdy wykonanie skryptu SAS nie powiedzie się.
@@ -67,12 +76,12 @@ def run_predeploy_sas(
         return
     log_file = package_dir / LOGS_DIR_NAME / LOG_PRE_DEPLOY_SAS
     try:
-        with open_sas_session(env) as sas_session:
+        with use_sas_session(env, sas_session) as session:
             script_content = ssh_executor.read_file(pre_deploy_script)
             full_sas_code = f"%let srodowisko = {env};\n{script_content}"
             info("Wykonywanie skryptu SAS")
             submit_sas_code(
-                sas_session=sas_session,
+                sas_session=session,
                 ssh_executor=ssh_executor,
                 sas_code=full_sas_code,
                 log_file=log_file,
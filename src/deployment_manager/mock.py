@@ -2,13 +2,17 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+import re
+import shlex
+import shutil
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
 from .bitbucket import BitbucketPlatform
-from .models import PullRequest
-from .logger import info
+from .models import PullRequest, parse_server_pr
+from .logger import debug, info
 
 __all__ = [
     "MockSSHExecutor",
@@ -20,7 +24,7 @@ __all__ = [
 RemotePath = PurePosixPath
 
 
-@dataclass
+@dataclass(slots=True)
 class MockResult:
     """Symulowany wynik komendy.
 
@@ -56,6 +60,15 @@ class MockSSHExecutor:
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.user = "mock_user"
         self.host = "mock_host"
+        self._mkdir_cache: set[Path] = set()
+        self._handlers: dict[
+            str, Callable[[str, RemotePath | None], MockResult]
+        ] = {
+            "git": self._handle_git_command,
+            "mkdir": self._handle_mkdir_command,
+            "test": self._handle_test_command,
+            "ls": self._handle_ls_command,
+        }
         info(f"[MOCK] SSHExecutor: base_dir={self.base_dir}")
 
     def _to_local(self, remote_path: RemotePath | str) -> Path:
@@ -67,10 +80,49 @@ class MockSSHExecutor:
         Returns:
             Odpowiadająca ścieżka lokalna.
         """
-        rp = PurePosixPath(remote_path)
+        return MockSSHExecutor._resolve(str(remote_path), str(self.base_dir))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _resolve(remote_path: str, base_dir: str) -> Path:
+        """Zamienia ścieżkę zdalną na lokalną (wynik zapamiętywany).
+
+        base_dir wchodzi do klucza cache, więc kilka executorów może
+        korzystać z niego równocześnie.
+
+        Args:
+            remote_path: Ścieżka zdalna jako string.
+            base_dir: Bazowy katalog lokalny jako string.
+
+        Returns:
+            Odpowiadająca ścieżka lokalna.
+        """
         # Usuń leading / żeby uzyskać relative path
-        relative = str(rp).lstrip("/")
-        return self.base_dir / relative
+        return Path(base_dir) / remote_path.lstrip("/")
+
+    def open_channel(self) -> MockSSHExecutor:
+        """Zwraca executor do użycia w innym wątku (w mocku ten sam obiekt).
+
+        Returns:
+            Ten sam obiekt MockSSHExecutor.
+        """
+        return self
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Symuluje grupowanie operacji (w mocku wykonywane są od razu).
+
+        Yields:
+            None.
+        """
+        yield
+
+    def flush(self) -> None:
+        """Symuluje wysłanie zakolejkowanych operacji (w mocku brak kolejki)."""
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Symuluje zamknięcie puli połączeń (w mocku brak połączeń)."""
 
     def run_command(
         self,
@@ -93,24 +145,30 @@ class MockSSHExecutor:
         prompt = f"[MOCK {self.user}@{self.host}]$ "
         info(f"{prompt}{command}")
 
-        # Specjalne obsłużenie niektórych komend
-        if "git " in command or command.startswith("git"):
-            return self._handle_git_command(command, cwd)
-        if command.startswith("mkdir "):
-            path_str = command.replace("mkdir -p ", "").strip().strip("'\"")
-            local_path = self._to_local(path_str)
-            local_path.mkdir(parents=True, exist_ok=True)
+        if "\n" in command:
+            for line in command.splitlines():
+                result = self._dispatch_command(line, cwd)
+                if not result.ok:
+                    return result
             return MockResult()
-        if command.startswith("test -e "):
-            path_str = command.replace("test -e ", "").strip().strip("'\"")
-            local_path = self._to_local(path_str)
-            ok = local_path.exists()
-            return MockResult(ok=ok, return_code=0 if ok else 1)
-        if command.startswith("ls "):
-            return self._handle_ls_command(command)
-
-        # Domyślnie - sukces
-        return MockResult()
+        return self._dispatch_command(command, cwd)
+
+    def _dispatch_command(self, command: str, cwd: RemotePath | None) -> MockResult:
+        """Symuluje pojedynczą komendę (bez logowania).
+
+        Args:
+            command: Komenda do wykonania.
+            cwd: Katalog roboczy.
+
+        Returns:
+            Symulowany wynik komendy.
+        """
+        head = command.lstrip().partition(" ")[0].rpartition("/")[2]
+        handler = self._handlers.get(head)
+        if handler is None:
+            # Domyślnie - sukces
+            return MockResult()
+        return handler(command, cwd)
 
     def _handle_git_command(
         self, command: str, cwd: RemotePath | None
@@ -124,34 +182,64 @@ class MockSSHExecutor:
         Returns:
             Symulowany wynik komendy git.
         """
-        local_cwd = self._to_local(cwd) if cwd else self.base_dir
-
-        if "clone" in command:
-            # Symuluj klonowanie - utwórz katalog repo
-            parts = command.split()
-            repo_dir_name = parts[-1].strip("'\"") if parts else "repo"
-            repo_path = local_cwd / repo_dir_name
-            repo_path.mkdir(parents=True, exist_ok=True)
-            info(f"[MOCK] git clone -> utworzono {repo_path}")
-            return MockResult()
+        parts = command.split()
+        git_sub = parts[1] if len(parts) > 1 else ""
+
+        match git_sub:
+            case "clone":
+                # Symuluj klonowanie - utwórz katalog repo
+                local_cwd = self._to_local(cwd) if cwd else self.base_dir
+                repo_path = local_cwd / parts[-1].strip("'\"")
+                repo_path.mkdir(parents=True, exist_ok=True)
+                info(f"[MOCK] git clone -> utworzono {repo_path}")
+                return MockResult()
+            case "merge-base":
+                return MockResult(stdout="abc123def456")
+            case _:
+                return MockResult()
+
+    def _handle_mkdir_command(
+        self, command: str, cwd: RemotePath | None
+    ) -> MockResult:
+        """Obsługuje komendę mkdir -p (jedna lub wiele ścieżek).
+
+        Args:
+            command: Komenda mkdir do obsłużenia.
+            cwd: Katalog roboczy (nieużywany).
+
+        Returns:
+            Symulowany wynik komendy mkdir.
+        """
+        for path_str in shlex.split(command)[2:]:
+            self._ensure_dir(self._to_local(path_str))
+        return MockResult()
 
-        if "diff" in command:
-            # Zwróć pustą listę zmian
-            return MockResult(stdout="")
+    def _handle_test_command(
+        self, command: str, cwd: RemotePath | None
+    ) -> MockResult:
+        """Obsługuje komendę test -e.
 
-        if "merge-base" in command:
-            return MockResult(stdout="abc123def456")
+        Args:
+            command: Komenda test do obsłużenia.
+            cwd: Katalog roboczy (nieużywany).
 
-        if "fetch" in command or "merge" in command:
+        Returns:
+            Symulowany wynik komendy test.
+        """
+        if not command.startswith("test -e "):
             return MockResult()
+        path_str = command.replace("test -e ", "").strip().strip("'\"")
+        ok = self._to_local(path_str).exists()
+        return MockResult(ok=ok, return_code=0 if ok else 1)
 
-        return MockResult()
-
-    def _handle_ls_command(self, command: str) -> MockResult:
+    def _handle_ls_command(
+        self, command: str, cwd: RemotePath | None
+    ) -> MockResult:
         """Obsługuje komendę ls.
 
         Args:
             command: Komenda ls do obsłużenia.
+            cwd: Katalog roboczy (nieużywany).
 
         Returns:
             Symulowany wynik komendy ls.
@@ -177,7 +265,7 @@ class MockSSHExecutor:
         """
         local_path = self._to_local(remote_path)
         exists = local_path.exists()
-        info(f"[MOCK] exists({remote_path}) -> {exists}")
+        debug("[MOCK] exists({}) -> {}", remote_path, exists)
         return exists
 
     def mkdir(self, remote_path: RemotePath) -> None:
@@ -186,9 +274,18 @@ class MockSSHExecutor:
         Args:
             remote_path: Ścieżka do katalogu do utworzenia.
         """
-        local_path = self._to_local(remote_path)
-        local_path.mkdir(parents=True, exist_ok=True)
-        info(f"[MOCK] mkdir({remote_path})")
+        self._ensure_dir(self._to_local(remote_path))
+        debug("[MOCK] mkdir({})", remote_path)
+
+    def _ensure_dir(self, local_path: Path) -> None:
+        """Tworzy katalog lokalny, jeśli mock jeszcze go nie utworzył.
+
+        Args:
+            local_path: Ścieżka lokalna katalogu.
+        """
+        if local_path not in self._mkdir_cache:
+            local_path.mkdir(parents=True, exist_ok=True)
+            self._mkdir_cache.add(local_path)
 
     def rmdir(self, remote_path: RemotePath) -> None:
         """Usuwa katalog.
@@ -197,11 +294,16 @@ class MockSSHExecutor:
             remote_path: Ścieżka do katalogu do usunięcia.
         """
         local_path = self._to_local(remote_path)
+        self._mkdir_cache = {
+            p for p in self._mkdir_cache
+            if p != local_path and not p.is_relative_to(local_path)
+        }
         if local_path.exists():
-            import shutil
-
-            shutil.rmtree(local_path)
-        info(f"[MOCK] rmdir({remote_path})")
+            try:
+                local_path.rmdir()
+            except OSError:
+                shutil.rmtree(local_path)
+        debug("[MOCK] rmdir({})", remote_path)
 
     def write_file(
         self, remote_path: RemotePath, content: str, *, encoding: str = "utf-8"
@@ -214,9 +316,39 @@ class MockSSHExecutor:
             encoding: Kodowanie tekstu.
         """
         local_path = self._to_local(remote_path)
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(local_path.parent)
         local_path.write_text(content, encoding=encoding)
-        info(f"[MOCK] write_file({remote_path})")
+        debug("[MOCK] write_file({})", remote_path)
+
+    def write_file_bulk(
+        self, remote_path: RemotePath, content: str, *, encoding: str = "utf-8"
+    ) -> None:
+        """Zapisuje plik (odpowiednik zapisu jednym poleceniem).
+
+        Args:
+            remote_path: Ścieżka do pliku.
+            content: Treść do zapisania.
+            encoding: Kodowanie tekstu.
+        """
+        self.write_file(remote_path, content, encoding=encoding)
+
+    def grep_lines(self, remote_path: RemotePath, pattern: str) -> str:
+        """Zwraca linie pliku pasujące do wyrażenia.
+
+        Args:
+            remote_path: Ścieżka do pliku.
+            pattern: Wyrażenie regularne.
+
+        Returns:
+            Pasujące linie rozdzielone znakiem nowej linii.
+        """
+        local_path = self._to_local(remote_path)
+        debug("[MOCK] grep_lines({}, {})", remote_path, pattern)
+        if not local_path.exists():
+            return ""
+        regex = re.compile(pattern)
+        lines = local_path.read_text(encoding="utf-8").splitlines()
+        return "\n".join(line for line in lines if regex.search(line))
 
     def read_file(
         self, remote_path: RemotePath, *, encoding: str = "utf-8"
@@ -231,7 +363,7 @@ class MockSSHExecutor:
             Zawartość pliku jako string.
         """
         local_path = self._to_local(remote_path)
-        info(f"[MOCK] read_file({remote_path})")
+        debug("[MOCK] read_file({})", remote_path)
         if local_path.exists():
             return local_path.read_text(encoding=encoding)
         return ""
@@ -255,10 +387,12 @@ class MockBitbucketPlatform(BitbucketPlatform):
         super().__init__(repo, token="mock_token", project_or_workspace="MOCK")
         info(f"[MOCK] BitbucketPlatform: repo={repo}")
 
-    def get_api_prs_url(self) -> str:
+    @property
+    def api_prs_url(self) -> str:
         return f"mock://bitbucket/{self.project_or_workspace}/{self.repo}/prs"
 
-    def get_clone_url(self) -> str:
+    @property
+    def clone_url(self) -> str:
         return f"mock://git/{self.project_or_workspace}/{self.repo}.git"
 
     def parse_pr(self, raw: dict[str, Any]) -> PullRequest:
@@ -270,7 +404,6 @@ class MockBitbucketPlatform(BitbucketPlatform):
         Returns:
             Sparsowany obiekt PullRequest.
         """
-        from .models import parse_server_pr
         return parse_server_pr(raw)
 
     def merge_pull_request(self, pr: PullRequest) -> tuple[bool, str | None]:
@@ -297,6 +430,9 @@ _MOCK_RAW_PRS: list[dict[str, Any]] = [
 ]
 
 
+_MOCK_PRS: tuple[PullRequest, ...] = tuple(map(parse_server_pr, _MOCK_RAW_PRS))
+
+
 def get_mock_pull_requests() -> list[PullRequest]:
     """Zwraca listę mockowych PR jako dataclass.
 
@@ -304,11 +440,10 @@ def get_mock_pull_requests() -> list[PullRequest]:
         Lista mockowych obiektów PullRequest.
     """
     info("[MOCK] Pobieranie listy PR")
-    platform = MockBitbucketPlatform("MOCK_REPO")
-    return [platform.parse_pr(raw) for raw in _MOCK_RAW_PRS]
+    return list(_MOCK_PRS)
 
 
-@dataclass
+@dataclass(slots=True)
 class MockSASSession:
     """Symulowana sesja SAS."""
 
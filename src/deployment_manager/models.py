@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from operator import itemgetter
+from typing import Any, Final
 
+_APPROVED: Final = itemgetter("approved")
 
-@dataclass
+
+@dataclass(slots=True)
 class PullRequest:
     """Reprezentacja Pull Requesta z Bitbucket.
     
@@ -17,7 +20,7 @@ class PullRequest:
         source_branch: Nazwa gałęzi źródłowej.
         approval_count: Liczba akceptacji.
         version: Wersja PR (tylko Bitbucket Server).
-        raw_data: Surowe dane z API.
+        raw_data: Surowe dane z API (puste, chyba że parser wywołano z keep_raw=True).
     """
     
     id: int
@@ -25,7 +28,7 @@ class PullRequest:
     source_branch: str
     approval_count: int
     version: int | None = None
-    raw_data: dict[str, Any] = field(default_factory=dict, repr=False)
+    raw_data: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
     
     def __lt__(self, other: object) -> bool:
         """Umożliwia sortowanie PR po id.
@@ -49,17 +52,31 @@ class PullRequest:
         return f"PR #{self.id}: {self.title} ({self.source_branch})"
 
 
-def parse_server_pr(raw: dict[str, Any]) -> PullRequest:
+def _count_approvals(entries: list[dict[str, Any]]) -> int:
+    """Zlicza akceptacje na liście recenzentów / uczestników PR.
+
+    Args:
+        entries: Wpisy recenzentów z API; każdy zawiera klucz "approved".
+
+    Returns:
+        Liczba wpisów z approved == True.
+    """
+    return list(map(_APPROVED, entries)).count(True)
+
+
+def parse_server_pr(raw: dict[str, Any], *, keep_raw: bool = False) -> PullRequest:
     """Parsuje odpowiedź Bitbucket Server do PullRequest.
 
     Args:
         raw: Surowe dane PR z API Bitbucket Server.
+        keep_raw: Czy zachować surowe dane w `raw_data` (domyślnie pusty
+            słownik, aby nie trzymać w pamięci całych odpowiedzi API).
 
     Returns:
         Obiekt PullRequest z wyparsowanymi danymi.
     """
     reviewers = raw.get("reviewers", [])
-    approval_count = sum(1 for r in reviewers if r.get("approved"))
+    approval_count = _count_approvals(reviewers)
     
     from_ref = raw.get("fromRef", {})
     source_branch = from_ref.get("displayId", "")
@@ -70,21 +87,23 @@ def parse_server_pr(raw: dict[str, Any]) -> PullRequest:
         source_branch=source_branch,
         approval_count=approval_count,
         version=raw.get("version"),
-        raw_data=raw,
+        raw_data=raw if keep_raw else {},
     )
 
 
-def parse_cloud_pr(raw: dict[str, Any]) -> PullRequest:
+def parse_cloud_pr(raw: dict[str, Any], *, keep_raw: bool = False) -> PullRequest:
     """Parsuje odpowiedź Bitbucket Cloud do PullRequest.
 
     Args:
         raw: Surowe dane PR z API Bitbucket Cloud.
+        keep_raw: Czy zachować surowe dane w `raw_data` (domyślnie pusty
+            słownik, aby nie trzymać w pamięci całych odpowiedzi API).
 
     Returns:
         Obiekt PullRequest z wyparsowanymi danymi.
     """
     participants = raw.get("participants", [])
-    approval_count = sum(1 for p in participants if p.get("approved"))
+    approval_count = _count_approvals(participants)
     
     source = raw.get("source", {})
     branch = source.get("branch", {})
@@ -96,5 +115,5 @@ def parse_cloud_pr(raw: dict[str, Any]) -> PullRequest:
         source_branch=source_branch,
         approval_count=approval_count,
         version=None,
-        raw_data=raw,
+        raw_data=raw if keep_raw else {},
     )
@@ -4,6 +4,7 @@ from __future__ import annotations
 import platform
 import re
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Final, Iterator
 from pathlib import Path
 
@@ -12,12 +13,19 @@ import saspy
 from ..logger import info, warn, error
 from .ssh_executor import SSHExecutor, RemotePath
 
-__all__ = ["resolve_sas_cfg", "open_sas_session", "submit_sas_code"]
+__all__ = ["resolve_sas_cfg", "open_sas_session", "use_sas_session", "submit_sas_code"]
 
 _WINDOWS_PREFIX: Final[str] = "ssh_win_batch_"
 _UNIX_PREFIX: Final[str] = "ssh_batch_"
+_IS_WINDOWS: Final[bool] = platform.system() == "Windows"
+_ERROR_RE: Final[re.Pattern[str]] = re.compile(r"^ERROR.*", re.MULTILINE)
+_ISSUE_RE: Final[re.Pattern[str]] = re.compile(r"^(?:ERROR|WARNING).*", re.MULTILINE)
+_CFG_FILE: Final[str] = str(
+    Path(__file__).resolve().parents[3] / "configs" / "sascfg_personal.py"
+)
 
 
+@lru_cache(maxsize=None)
 def resolve_sas_cfg(env: str) -> str:
     """Zwraca nazwę konfiguracji saspy dla danego *env*.
 
@@ -31,7 +39,7 @@ def resolve_sas_cfg(env: str) -> str:
     Returns:
         Nazwa konfiguracji saspy dla podanego środowiska.
     """
-    prefix = _WINDOWS_PREFIX if platform.system() == "Windows" else _UNIX_PREFIX
+    prefix = _WINDOWS_PREFIX if _IS_WINDOWS else _UNIX_PREFIX
     return f"{prefix}{env.lower()}"
 
 
@@ -53,10 +61,9 @@ def open_sas_session(env: str) -> Iterator[saspy.SASsession]:
     sas_session = None
     try:
         cfgname = resolve_sas_cfg(env)
-        cfgfile = Path(__file__).resolve().parents[3] / "configs" / "sascfg_personal.py"
         info(f"Nawiązywanie połączenia SAS z konfiguracją: {cfgname}")
         sas_session = saspy.SASsession(
-            cfgname=cfgname, cfgfile=str(cfgfile), verbose=False, results="TEXT"
+            cfgname=cfgname, cfgfile=_CFG_FILE, verbose=False, results="TEXT"
         )
         info("Połączenie SAS nawiązane pomyślnie.")
         yield sas_session
@@ -66,6 +73,29 @@ def open_sas_session(env: str) -> Iterator[saspy.SASsession]:
             sas_session.endsas()
 
 
+@contextmanager
+def use_sas_session(
+    env: str, sas_session: saspy.SASsession | None = None
+) -> Iterator[saspy.SASsession]:
+    """Zwraca przekazaną sesję SAS lub otwiera nową, gdy jej brak.
+
+    Pozwala krokom wdrożenia korzystać ze wspólnej sesji otwartej raz przez
+    orkiestrator; przekazana sesja nie jest zamykana przy wyjściu.
+
+    Args:
+        env: Nazwa środowiska (np. 'dev', 'prod').
+        sas_session: Istniejąca sesja SAS lub None.
+
+    Yields:
+        Sesja SAS do użycia.
+    """
+    if sas_session is not None:
+        yield sas_session
+        return
+    with open_sas_session(env) as session:
+        yield session
+
+
 def submit_sas_code(
     sas_session: saspy.SASsession,
     ssh_executor: SSHExecutor,
@@ -111,10 +141,14 @@ def _check_sas_log(log_content: str, *, report_warnings: bool = True) -> tuple[b
     Returns:
         Krotka (czy wystąpiły błędy, czy wystąpiły ostrzeżenia).
     """
-    error_lines = re.findall(r"^ERROR.*", log_content, flags=re.MULTILINE)
+    error_lines: list[str] = []
     warning_lines: list[str] = []
     if report_warnings:
-        warning_lines = re.findall(r"^WARNING.*", log_content, flags=re.MULTILINE)
+        for match in _ISSUE_RE.finditer(log_content):
+            line = match.group()
+            (error_lines if line[0] == "E" else warning_lines).append(line)
+    else:
+        error_lines = _ERROR_RE.findall(log_content)
 
     for line in error_lines:
         error(f"{line}")
@@ -1,33 +1,71 @@
 """Operacje SSH z wykorzystaniem biblioteki Fabric."""
 from __future__ import annotations
 
-from io import BytesIO
+import base64
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import PurePosixPath
+import select
 import shlex
 import shutil
+import string
 import textwrap
+import threading
+import time
+from typing import Iterator
+import uuid
 
 
 from fabric import Connection
-from invoke.exceptions import UnexpectedExit
+from fabric.runners import Result as FabricResult
+from invoke.exceptions import CommandTimedOut, UnexpectedExit
 from invoke.runners import Result
+from paramiko.channel import Channel
+from paramiko.ssh_exception import SSHException
 
-from ..logger import error, info
+from ..logger import error, info, on_terminal_resize
 
 RemotePath = PurePosixPath
 
 LOG_PREFIKS_LENGTH = 29
+BULK_WRITE_MAX_CHARS = 64 * 1024
+SHELL_READ_CHUNK = 64 * 1024
+SHELL_START_TIMEOUT = 15
+MAX_EXEC_CHANNELS = 6
+_SHELL_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "_@%+=:,./-")
+
+_quote_unsafe = lru_cache(maxsize=4096)(shlex.quote)
+
 
 def quote_shell(value: RemotePath | str) -> str:
     """Zwraca bezpiecznie zacytowaną (shell) reprezentację ścieżki/napisu.
 
+    Napisy złożone wyłącznie z bezpiecznych znaków (typowe ścieżki) zwracane
+    są bez zmian, bez wywołania wyrażenia regularnego z shlex.quote.
+
     Args:
         value: Wartość do zacytowania.
 
     Returns:
         Bezpiecznie zacytowany string.
     """
-    return shlex.quote(str(value))
+    text = str(value)
+    if text and _SHELL_SAFE_CHARS.issuperset(text):
+        return text
+    return _quote_unsafe(text)
+
+
+@lru_cache(maxsize=1)
+def _term_columns() -> int:
+    """Zwraca liczbę kolumn terminala zapamiętaną do najbliższego SIGWINCH.
+
+    Returns:
+        Szerokość terminala (120, gdy nie da się jej ustalić).
+    """
+    return shutil.get_terminal_size(fallback=(120, 40)).columns
+
+
+on_terminal_resize(_term_columns.cache_clear)
 
 
 def _wrap_command(command: str, *, prefix: str) -> str:
@@ -40,7 +78,7 @@ def _wrap_command(command: str, *, prefix: str) -> str:
     Returns:
         Zawinięta komenda z prefiksem.
     """
-    term_width = shutil.get_terminal_size(fallback=(120, 40)).columns
+    term_width = _term_columns()
     content_width = max(10, term_width - len(prefix) - LOG_PREFIKS_LENGTH)
     return textwrap.fill(
         command,
@@ -52,13 +90,137 @@ def _wrap_command(command: str, *, prefix: str) -> str:
     )
 
 
+class _PersistentShell:
+    """Długo żyjący kanał powłoki, w którym polecenia wykonywane są kolejno.
+
+    W kanale uruchamiany jest zawsze /bin/sh (niezależnie od powłoki
+    logowania użytkownika, np. csh), bo ramka poleceń wymaga składni POSIX.
+    Każde polecenie przekazywane jest jako zacytowany argument eval w podpowłoce
+    (błąd składni kończy tylko podpowłokę), a po nim powłoka wypisuje unikalny
+    znacznik z kodem wyjścia (stdout) i znacznik końca (stderr).
+    Zastępuje otwieranie nowego kanału exec dla każdego polecenia.
+    """
+
+    def __init__(self, conn: Connection):
+        """Otwiera kanał, uruchamia w nim /bin/sh i sprawdza, czy odpowiada.
+
+        Przed zwróceniem obiektu w powłoce wykonywane jest puste polecenie;
+        ewentualne wyjście skryptów startowych konta trafia do jego wyniku,
+        a nie do pierwszego właściwego polecenia.
+
+        Args:
+            conn: Obiekt połączenia Fabric (otwierany, jeśli trzeba).
+
+        Raises:
+            SSHException: Gdy nie udało się otworzyć kanału lub powłoka nie
+                odpowiedziała w SHELL_START_TIMEOUT sekund.
+        """
+        conn.open()
+        self._chan: Channel = conn.client.get_transport().open_session()
+        self._chan.exec_command("exec /bin/sh")
+        self._fd = self._chan.fileno()
+        try:
+            outcome = self.run(":", SHELL_START_TIMEOUT)
+        except (TimeoutError, OSError):
+            outcome = None
+        if outcome is None or outcome[2] != 0:
+            self.close()
+            raise SSHException("Nie udało się uruchomić trwałej powłoki /bin/sh.")
+
+    @property
+    def alive(self) -> bool:
+        """Czy powłoka nadal działa i może przyjąć kolejne polecenie."""
+        chan = self._chan
+        return not (chan.closed or chan.eof_received or chan.exit_status_ready())
+
+    def close(self) -> None:
+        """Zamyka kanał (kończy powłokę)."""
+        self._chan.close()
+
+    def run(self, command: str, timeout: float | None) -> tuple[str, str, int] | None:
+        """Wykonuje polecenie i czeka na jego znaczniki końca.
+
+        Args:
+            command: Polecenie do wykonania.
+            timeout: Limit czasu wykonania w sekundach.
+
+        Returns:
+            Krotka (stdout, stderr, kod wyjścia) lub None, gdy powłoka
+            zakończyła się przed wypisaniem znaczników.
+
+        Raises:
+            TimeoutError: Gdy polecenie nie zakończyło się w limicie czasu.
+        """
+        token = uuid.uuid4().hex.encode("ascii")
+        self._chan.sendall(
+            b"( eval " + shlex.quote(command).encode() + b" ) </dev/null\n"
+            b"printf '\\n" + token + b" %s\\n' $?\n"
+            b"printf '\\n" + token + b"\\n' >&2\n"
+        )
+        out_marker = b"\n" + token + b" "
+        err_marker = b"\n" + token + b"\n"
+        out = bytearray()
+        err = bytearray()
+        out_end = err_end = -1
+        out_scan = err_scan = 0
+        return_code = -1
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while out_end < 0 or err_end < 0:
+            wait = None if deadline is None else deadline - time.monotonic()
+            if wait is not None and wait <= 0:
+                raise TimeoutError(command)
+            select.select([self._fd], [], [], wait)
+            received = False
+            if self._chan.recv_ready():
+                out += self._chan.recv(SHELL_READ_CHUNK)
+                received = True
+            if self._chan.recv_stderr_ready():
+                err += self._chan.recv_stderr(SHELL_READ_CHUNK)
+                received = True
+            if not received:
+                if self._chan.closed or self._chan.eof_received:
+                    return None
+                continue
+            if out_end < 0:
+                idx = out.find(out_marker, out_scan)
+                if idx < 0:
+                    out_scan = max(0, len(out) - len(out_marker))
+                else:
+                    nl = out.find(b"\n", idx + len(out_marker))
+                    if nl >= 0:
+                        return_code = int(out[idx + len(out_marker):nl])
+                        out_end = idx
+            if err_end < 0:
+                idx = err.find(err_marker, err_scan)
+                if idx < 0:
+                    err_scan = max(0, len(err) - len(err_marker))
+                else:
+                    err_end = idx
+
+        return (
+            out[:out_end].decode("utf-8", errors="replace"),
+            err[:err_end].decode("utf-8", errors="replace"),
+            return_code,
+        )
+
+
 class SSHExecutor:
     """Wykonywanie poleceń i operacji na plikach na zdalnym hoście przez SSH.
 
+    Połączenia są współdzielone w obrębie procesu: kolejne executory dla tego
+    samego hosta, użytkownika i limitu czasu korzystają z jednego obiektu
+    Connection (bez ponownego uzgadniania kluczy i uwierzytelniania).
+
     Attributes:
         conn: Obiekt połączenia Fabric.
     """
 
+    _pool: dict[
+        tuple[str, str, float | None], tuple[Connection, threading.BoundedSemaphore]
+    ] = {}
+    _pool_lock = threading.Lock()
+
     def __init__(self, host: str, user: str, *, connect_timeout: float | None = None):
         """Inicjalizuje obiekt połączenia SSH.
 
@@ -67,7 +229,222 @@ class SSHExecutor:
             user: Nazwa użytkownika SSH.
             connect_timeout: Limit czasu połączenia w sekundach.
         """
-        self.conn = Connection(host=host, user=user, connect_timeout=connect_timeout)
+        conn, channel_slots = SSHExecutor._get_conn(host, user, connect_timeout)
+        self._init_state(conn, channel_slots, exec_only=False)
+
+    def _init_state(
+        self,
+        conn: Connection,
+        channel_slots: threading.BoundedSemaphore,
+        *,
+        exec_only: bool,
+    ) -> None:
+        """Ustawia stan executora (wspólne dla __init__ i open_channel).
+
+        Args:
+            conn: Współdzielony obiekt połączenia Fabric.
+            channel_slots: Semafor kanałów exec przypisany do połączenia.
+            exec_only: Czy executor służy wyłącznie do poleceń exec (bez
+                trwałej powłoki i SFTP).
+        """
+        self.conn = conn
+        self._batching = False
+        self._pending: list[str] = []
+        self._shell: _PersistentShell | None = None
+        self._shell_enabled = not exec_only
+        self._shell_lock = threading.Lock()
+        self._channel_slots = channel_slots
+        self._exec_only = exec_only
+
+    @classmethod
+    def _get_conn(
+        cls, host: str, user: str, connect_timeout: float | None
+    ) -> tuple[Connection, threading.BoundedSemaphore]:
+        """Zwraca połączenie z puli procesu, tworząc je przy pierwszym użyciu.
+
+        Razem z połączeniem przechowywany jest semafor ograniczający liczbę
+        jednocześnie otwartych kanałów exec (MAX_EXEC_CHANNELS), wspólny dla
+        wszystkich executorów korzystających z tego połączenia.
+
+        Args:
+            host: Nazwa hosta lub adres IP.
+            user: Nazwa użytkownika SSH.
+            connect_timeout: Limit czasu połączenia w sekundach.
+
+        Returns:
+            Krotka (współdzielony obiekt połączenia Fabric, semafor kanałów).
+        """
+        key = (host, user, connect_timeout)
+        with cls._pool_lock:
+            entry = cls._pool.get(key)
+            if entry is None:
+                entry = (
+                    Connection(host=host, user=user, connect_timeout=connect_timeout),
+                    threading.BoundedSemaphore(MAX_EXEC_CHANNELS),
+                )
+                cls._pool[key] = entry
+            return entry
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Zamyka wszystkie połączenia z puli (wywoływane przy zakończeniu programu)."""
+        with cls._pool_lock:
+            connections = [conn for conn, _ in cls._pool.values()]
+            cls._pool.clear()
+        for conn in connections:
+            conn.close()
+
+    def open_channel(self) -> SSHExecutor:
+        """Zwraca executor współdzielący połączenie SSH do użycia w innym wątku.
+
+        Połączenie (transport SSH) nawiązywane jest tutaj, w wątku wywołującym,
+        jeśli jeszcze nie istnieje; zwrócony executor otwiera dla każdego
+        polecenia osobny kanał exec na tym samym transporcie, bez ponownego
+        uwierzytelniania. Executor jest przeznaczony wyłącznie do poleceń
+        (run_command, exists, grep_lines) - operacje SFTP zgłaszają błąd,
+        bo klient SFTP połączenia nie jest bezpieczny przy użyciu z wielu
+        wątków. Liczbę jednocześnie otwartych kanałów exec ogranicza wspólny
+        semafor połączenia z puli (MAX_EXEC_CHANNELS), tak aby razem z trwałą
+        powłoką i kanałem SFTP zostać poniżej typowego limitu MaxSessions
+        serwera (10).
+
+        Returns:
+            Executor korzystający ze wspólnego połączenia.
+        """
+        self.conn.open()
+        channel = SSHExecutor.__new__(SSHExecutor)
+        channel._init_state(self.conn, self._channel_slots, exec_only=True)
+        return channel
+
+    def _check_sftp_allowed(self) -> None:
+        """Zgłasza błąd, gdy executor z open_channel próbuje użyć SFTP.
+
+        Raises:
+            RuntimeError: Gdy executor służy wyłącznie do poleceń exec.
+        """
+        if self._exec_only:
+            raise RuntimeError(
+                "Executor z open_channel() obsługuje tylko polecenia (bez SFTP)."
+            )
+
+    def _run(self, command: str, timeout: float | None = None) -> Result:
+        """Wykonuje polecenie bez logowania i bez zgłaszania błędu kodu wyjścia.
+
+        Polecenie trafia do trwałej powłoki (jeden kanał na cały przebieg).
+        Zwykły kanał exec używany jest tylko wtedy, gdy polecenie nie zostało
+        wysłane do powłoki: powłoki nie da się otworzyć, nie działa już albo
+        jest zajęta przez inny wątek.
+
+        Args:
+            command: Polecenie do wykonania.
+            timeout: Limit czasu wykonania w sekundach.
+
+        Returns:
+            Obiekt Result z wynikiem polecenia.
+
+        Raises:
+            CommandTimedOut: Gdy polecenie przekroczy limit czasu.
+            SSHException: Gdy powłoka przestała działać w trakcie polecenia
+                (polecenie nie jest ponawiane, bo mogło się już wykonać).
+        """
+        if self._shell_enabled and self._shell_lock.acquire(blocking=False):
+            try:
+                result = self._run_in_shell(command, timeout)
+            finally:
+                self._shell_lock.release()
+            if result is not None:
+                return result
+        with self._channel_slots:
+            return self.conn.run(command, hide=True, warn=True, pty=False, timeout=timeout)
+
+    def _run_in_shell(self, command: str, timeout: float | None) -> Result | None:
+        """Wykonuje polecenie w trwałej powłoce (wywoływane pod `_shell_lock`).
+
+        Args:
+            command: Polecenie do wykonania.
+            timeout: Limit czasu wykonania w sekundach.
+
+        Returns:
+            Obiekt Result albo None, gdy powłoka jest niedostępna i polecenie
+            nie zostało do niej wysłane.
+
+        Raises:
+            CommandTimedOut: Gdy polecenie przekroczy limit czasu.
+            SSHException: Gdy powłoka zakończyła się w trakcie polecenia.
+            OSError: Gdy kanał powłoki zawiódł w trakcie polecenia.
+        """
+        if self._shell is not None and not self._shell.alive:
+            self._drop_shell()
+            return None
+        if self._shell is None:
+            try:
+                self._shell = _PersistentShell(self.conn)
+            except (SSHException, OSError):
+                self._shell_enabled = False
+                return None
+        try:
+            outcome = self._shell.run(command, timeout)
+        except TimeoutError:
+            self._shell.close()
+            self._shell = None
+            raise CommandTimedOut(
+                FabricResult(connection=self.conn, command=command, exited=-1),
+                timeout,  # type: ignore[arg-type]
+            ) from None
+        except (SSHException, OSError):
+            self._drop_shell()
+            raise
+        if outcome is None:
+            self._drop_shell()
+            raise SSHException(
+                f"Powłoka zdalna zakończyła się w trakcie polecenia: {command}"
+            )
+        stdout, stderr, return_code = outcome
+        return FabricResult(
+            connection=self.conn,
+            stdout=stdout,
+            stderr=stderr,
+            command=command,
+            exited=return_code,
+            hide=("stdout", "stderr"),
+        )
+
+    def _drop_shell(self) -> None:
+        """Zamyka trwałą powłokę i przełącza executor na kanały exec."""
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+        self._shell_enabled = False
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Grupuje operacje mkdir/rmdir, aby wysłać je jednym poleceniem zdalnym.
+
+        Wewnątrz bloku mkdir i rmdir są tylko kolejkowane. Kolejka jest
+        wysyłana razem z najbliższym run_command (przed nim, w tym samym
+        wywołaniu), przed exists, read_file, write_file i write_file_bulk
+        albo przy wyjściu z bloku. Przy wyjątku kolejka jest porzucana.
+        Kolejka wykonywana jest w osobnej podpowłoce z `set -e`; jej błąd
+        kończy skrypt z tym samym kodem, a polecenie wywołującego wykonywane
+        jest po niej bez `set -e`, więc nie zmienia ono znaczenia polecenia.
+
+        Yields:
+            None.
+        """
+        self._batching = True
+        try:
+            yield
+        except BaseException:
+            self._pending.clear()
+            raise
+        finally:
+            self._batching = False
+        self.flush()
+
+    def flush(self) -> None:
+        """Wykonuje zakolejkowane operacje jednym poleceniem zdalnym."""
+        if self._pending:
+            self.run_command(":")
 
     def run_command(
         self,
@@ -78,6 +455,9 @@ class SSHExecutor:
     ) -> Result:
         """Uruchamia polecenie na zdalnym hoście.
 
+        Katalog roboczy dołączany jest jako prefiks `cd ... &&` zamiast
+        współdzielonego stosu conn.cd, więc metodę można wywoływać z wielu wątków.
+
         Args:
             command: Polecenie do wykonania.
             cwd: Katalog roboczy dla polecenia.
@@ -90,11 +470,19 @@ class SSHExecutor:
         Raises:
             UnexpectedExit: Gdy polecenie zakończy się błędem.
         """
+        if cwd:
+            command = f"cd {quote_shell(cwd)} && {command}"
+        if self._pending:
+            command = "\n".join([
+                "( set -e", *self._pending, ")",
+                "_rc=$?; [ $_rc -eq 0 ] || exit $_rc",
+                command,
+            ])
+            self._pending.clear()
         prompt = f"[{self.conn.user}@{self.conn.host}]$ "
         info(_wrap_command(command, prefix=prompt))
         try:
-            with self.conn.cd(str(cwd) if cwd else "."):
-                result = self.conn.run(command, hide=True, warn=True, pty=False, timeout=timeout)
+            result = self._run(command, timeout=timeout)
 
             if not result.ok:
                 raise UnexpectedExit(result)
@@ -119,8 +507,9 @@ class SSHExecutor:
         Returns:
             True jeśli ścieżka istnieje, False w przeciwnym przypadku.
         """
+        self.flush()
         cmd = f"test -e {quote_shell(remote_path)}"
-        return self.conn.run(cmd, hide=True, warn=True, pty=False).ok
+        return self._run(cmd).ok
 
     def mkdir(self, remote_path: RemotePath) -> None:
         """Tworzy katalog (rekurencyjnie) na zdalnym hoście (odpowiednik mkdir -p).
@@ -128,7 +517,11 @@ class SSHExecutor:
         Args:
             remote_path: Ścieżka do katalogu do utworzenia.
         """
-        self.run_command(f"mkdir -p {quote_shell(remote_path)}")
+        cmd = f"mkdir -p {quote_shell(remote_path)}"
+        if self._batching:
+            self._pending.append(cmd)
+        else:
+            self.run_command(cmd)
 
     def rmdir(self, remote_path: RemotePath) -> None:
         """Usuwa rekursywnie plik lub katalog na zdalnym hoście.
@@ -136,28 +529,88 @@ class SSHExecutor:
         Args:
             remote_path: Ścieżka do usunięcia.
         """
-        self.run_command(f"rm -rf {quote_shell(remote_path)}")
+        cmd = f"rm -rf {quote_shell(remote_path)}"
+        if self._batching:
+            self._pending.append(cmd)
+        else:
+            self.run_command(cmd)
 
     def write_file(self, remote_path: RemotePath, content: str, *, encoding: str = "utf-8") -> None:
         """Zapisuje zawartość tekstową do pliku na zdalnym hoście.
 
-        Używa kodowania UTF-8 i przesyła bajty (BytesIO) kompatybilne z SFTP.
+        Bajty zapisywane są bezpośrednio do pliku SFTP w trybie potokowym
+        (bez czekania na potwierdzenie każdego bloku i bez bufora pośredniego).
+
+        Args:
+            remote_path: Ścieżka do pliku docelowego.
+            content: Treść do zapisania.
+            encoding: Kodowanie tekstu (domyślnie UTF-8).
+
+        Raises:
+            RuntimeError: Gdy executor pochodzi z open_channel (bez SFTP).
+        """
+        self._check_sftp_allowed()
+        self.flush()
+        prompt = f"[{self.conn.user}@{self.conn.host}]$ "
+        info(_wrap_command(f"write > {remote_path}", prefix=prompt))
+        with self.conn.sftp().open(str(remote_path), "wb") as remote_file:
+            remote_file.set_pipelined(True)
+            remote_file.write(content.encode(encoding))
+
+    def write_file_bulk(
+        self, remote_path: RemotePath, content: str, *, encoding: str = "utf-8"
+    ) -> None:
+        """Zapisuje plik jednym poleceniem zdalnym (base64 w linii poleceń).
+
+        Treść przesyłana jest w jednym wywołaniu zamiast sesji SFTP. Gdy
+        zakodowana treść przekracza BULK_WRITE_MAX_CHARS (limit długości linii
+        poleceń; ARG_MAX na AIX bywa niski) lub na serwerze brak polecenia
+        base64, używany jest zwykły `write_file`.
 
         Args:
             remote_path: Ścieżka do pliku docelowego.
             content: Treść do zapisania.
             encoding: Kodowanie tekstu (domyślnie UTF-8).
         """
+        self.flush()
+        encoded = base64.b64encode(content.encode(encoding)).decode("ascii")
+        if len(encoded) > BULK_WRITE_MAX_CHARS:
+            self.write_file(remote_path, content, encoding=encoding)
+            return
         prompt = f"[{self.conn.user}@{self.conn.host}]$ "
         info(_wrap_command(f"write > {remote_path}", prefix=prompt))
-        data = content.encode(encoding)
-        bytes_io = BytesIO(data)
-        self.conn.put(bytes_io, remote=str(remote_path))
+        cmd = f"printf %s {encoded} | base64 -d > {quote_shell(remote_path)}"
+        if not self._run(cmd).ok:
+            self.write_file(remote_path, content, encoding=encoding)
+
+    def grep_lines(self, remote_path: RemotePath, pattern: str) -> str:
+        """Zwraca linie pliku zdalnego pasujące do wyrażenia (grep -E).
+
+        Filtrowanie odbywa się na serwerze, więc przesyłane są tylko pasujące
+        linie zamiast całego pliku. Brak dopasowań (kod 1 grep) nie jest
+        błędem; brak pliku lub błąd odczytu (kod 2) jest zgłaszany.
+
+        Args:
+            remote_path: Ścieżka do pliku.
+            pattern: Rozszerzone wyrażenie regularne (ERE).
+
+        Returns:
+            Pasujące linie rozdzielone znakiem nowej linii.
+
+        Raises:
+            UnexpectedExit: Gdy pliku nie ma lub nie da się go odczytać.
+        """
+        result = self.run_command(
+            f"grep -E {quote_shell(pattern)} {quote_shell(remote_path)}; "
+            "rc=$?; [ $rc -le 1 ]"
+        )
+        return result.stdout
 
     def read_file(self, remote_path: RemotePath, *, encoding: str = "utf-8") -> str:
         """Odczytuje zawartość pliku ze zdalnego hosta jako tekst.
 
-        Pobiera plik do bufora bajtowego (BytesIO), a następnie dekoduje do `str`.
+        Plik czytany jest przez SFTP z prefetch (wiele żądań odczytu w locie),
+        a następnie dekodowany do `str`.
 
         Args:
             remote_path: Ścieżka do pliku źródłowego.
@@ -165,9 +618,14 @@ class SSHExecutor:
 
         Returns:
             Zawartość pliku jako string.
+
+        Raises:
+            RuntimeError: Gdy executor pochodzi z open_channel (bez SFTP).
         """
+        self._check_sftp_allowed()
+        self.flush()
         prompt = f"[{self.conn.user}@{self.conn.host}]$ "
         info(_wrap_command(f"read < {remote_path}", prefix=prompt))
-        buffer = BytesIO()
-        self.conn.get(str(remote_path), local=buffer)
-        return buffer.getvalue().decode(encoding)
+        with self.conn.sftp().open(str(remote_path), "rb") as remote_file:
+            remote_file.prefetch()
+            return remote_file.read().decode(encoding)